@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import random
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import aiohttp
+
+from telemetry import get_logger, telemetry
+
+log = get_logger('inference')
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class InferenceHTTPError(Exception):
+    """Non-retryable (or retries exhausted) error from the inference endpoint"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class AsyncTextGenerationClient:
+    """Non-blocking text-generation client for Hugging Face / TGI-compatible endpoints.
+    
+    One pooled aiohttp session is shared by every request. Each request has an
+    overall deadline, and 429/5xx responses are retried with jittered exponential backoff.
+    """
+    
+    def __init__(self, model: str, token: Optional[str] = None, url: Optional[str] = None,
+                 deadline: Optional[float] = None, max_retries: Optional[int] = None,
+                 pool_size: Optional[int] = None):
+        self.model = model
+        self.token = token
+        self.url = url or os.getenv('HF_INFERENCE_URL') or f'https://api-inference.huggingface.co/models/{model}'
+        self.deadline = deadline or float(os.getenv('HF_REQUEST_DEADLINE', '120'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HF_MAX_RETRIES', '4'))
+        self.pool_size = pool_size or int(os.getenv('HF_POOL_SIZE', '8'))
+        self.base_delay = 0.5
+        self.max_delay = 20.0
+        self.retries = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def session(self) -> aiohttp.ClientSession:
+        """Shared pooled session, created on first use"""
+        if self._session is None or self._session.closed:
+            headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            )
+        return self._session
+    
+    def _payload(self, prompt: str, params: Dict, stream: bool) -> Dict:
+        parameters = dict(params)
+        parameters.setdefault('return_full_text', False)
+        return {'inputs': prompt, 'parameters': parameters, 'stream': stream}
+    
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+    
+    async def _request(self, payload: Dict):
+        """POST with retries; returns an open response the caller must release"""
+        session = await self.session()
+        attempt = 0
+        while True:
+            try:
+                response = await session.post(self.url, json=payload)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+                reason = type(e).__name__
+                log.warning(f"🔁 Inference connection error ({reason}), retrying in {delay:.1f}s")
+            else:
+                if response.status < 400:
+                    return response
+                body = await response.text()
+                response.release()
+                if response.status not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                    raise InferenceHTTPError(response.status, body[:200])
+                delay = self._backoff(attempt, response.headers.get('Retry-After'))
+                reason = str(response.status)
+                log.warning(f"🔁 Inference endpoint returned {response.status}, retrying in {delay:.1f}s")
+            self.retries += 1
+            telemetry.inc('inference_retries_total', reason=reason)
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    async def text_generation(self, prompt: str, **params) -> str:
+        """Generate the full completion for `prompt` within the request deadline"""
+        async def run():
+            response = await self._request(self._payload(prompt, params, stream=False))
+            try:
+                body = await response.read()
+            finally:
+                response.release()
+            telemetry.inc('bytes_received_total', len(body), source='inference')
+            data = json.loads(body)
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            if 'error' in data:
+                raise InferenceHTTPError(response.status, str(data['error']))
+            return data.get('generated_text', '')
+        return await asyncio.wait_for(run(), self.deadline)
+    
+    async def stream_text_generation(self, prompt: str, **params) -> AsyncIterator[str]:
+        """Yield generated tokens as the endpoint streams them (server-sent events)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        response = await asyncio.wait_for(self._request(self._payload(prompt, params, stream=True)), self.deadline)
+        try:
+            if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                # Endpoint does not stream; return the whole completion at once
+                body = await response.read()
+                telemetry.inc('bytes_received_total', len(body), source='inference')
+                data = json.loads(body)
+                if isinstance(data, list):
+                    data = data[0] if data else {}
+                yield data.get('generated_text', '')
+                return
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError("Inference stream exceeded its deadline")
+                line = await asyncio.wait_for(response.content.readline(), remaining)
+                if not line:
+                    break
+                telemetry.inc('bytes_received_total', len(line), source='inference')
+                line = line.decode().strip()
+                if not line.startswith('data:'):
+                    continue
+                event = json.loads(line[len('data:'):].strip())
+                if 'error' in event:
+                    raise InferenceHTTPError(response.status, str(event['error']))
+                token = (event.get('token') or {})
+                if token.get('special'):
+                    continue
+                if token.get('text'):
+                    yield token['text']
+        finally:
+            response.release()
+    
+    async def generate(self, prompt: str, on_token: Optional[Callable[[str], None]] = None, **params) -> str:
+        """Full completion, streamed through `on_token` when a callback is given"""
+        if on_token is None:
+            return await self.text_generation(prompt, **params)
+        parts = []
+        async for token in self.stream_text_generation(prompt, **params):
+            parts.append(token)
+            on_token(token)
+        return ''.join(parts)
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,233 @@
+"""Offline end-to-end benchmark of the real main() flow.
+
+Starts benchmarks/fixture_server.py (synthetic login/board pages plus a fake
+text-generation endpoint), points main.py at it through TRELLO_BASE_URL,
+TRELLO_BOARD_URL and HF_INFERENCE_URL, and runs the full scrape -> analyze ->
+report flow in a fresh interpreter per run. The first run per scenario is cold
+(full login); later runs restore the saved session and hit the snapshot store.
+Per-phase latency (from the telemetry.py spans), counters, throughput and peak
+RSS are written as JSON.
+
+    python benchmarks/e2e_benchmark.py --members 50,500 --latency-ms 50 --overflow --runs 2 --output e2e.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_SERVER = os.path.join(REPO_ROOT, 'benchmarks', 'fixture_server.py')
+BROWSER_SERVER_FILE = os.path.join(tempfile.gettempdir(), 'trello_e2e_browser_server.json')
+
+
+# Spans recorded by telemetry.py that make up a run
+PHASES = ['setup_browser', 'session_probe', 'login', 'navigate', 'extraction', 'enrichment', 'analysis', 'inference',
+          'reports']
+
+
+# --- Child: run main() and collect its telemetry -------------------------
+
+def run_child(result_path: str):
+    sys.path.insert(0, REPO_ROOT)
+    import main as app
+    from telemetry import telemetry
+
+    started = time.perf_counter()
+    asyncio.run(app.main())
+    total = time.perf_counter() - started
+
+    totals = telemetry.totals()
+    phases = {phase: totals[phase] for phase in PHASES if phase in totals}
+    counters: Dict[str, float] = {}
+    for (name, _), value in telemetry.counters.items():
+        counters[name] = counters.get(name, 0) + value
+
+    members_csv = os.path.join('data', 'members.csv')
+    members = 0
+    if os.path.exists(members_csv):
+        with open(members_csv) as f:
+            members = max(0, sum(1 for _ in f) - 1)
+
+    result = {
+        'total_s': round(total, 4),
+        'phases_s': {phase: round(seconds, 4) for phase, seconds in phases.items()},
+        'counters': counters,
+        'members': members,
+        'members_per_s': round(members / total, 1) if total else 0,
+        # ru_maxrss is KiB on Linux. Children = largest reaped descendant (browser/driver)
+        'python_peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'browser_peak_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+    with open(result_path, 'w') as f:
+        json.dump(result, f)
+
+
+# --- Parent: fixture server + runs ---------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_stats(base_url: str) -> Dict:
+    with urllib.request.urlopen(f'{base_url}/__stats', timeout=5) as response:
+        return json.load(response)
+
+
+def start_fixture_server(port: int, members: int, args) -> subprocess.Popen:
+    command = [sys.executable, FIXTURE_SERVER, '--port', str(port), '--members', str(members),
+               '--latency-ms', str(args.latency_ms), '--facepile-size', str(args.facepile_size),
+               '--token-latency-ms', str(args.token_latency_ms), '--tokens', str(args.tokens),
+               '--profile-rps', str(args.profile_rps), '--throttle-mode', args.throttle_mode]
+    if args.overflow:
+        command.append('--overflow')
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            server_stats(f'http://127.0.0.1:{port}')
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("Fixture server did not start")
+
+
+def child_env(base_url: str, args) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        'TRELLO_BASE_URL': base_url,
+        'TRELLO_BOARD_URL': f'{base_url}/b/bench/benchmark-board',
+        'TRELLO_BOARD_URLS': '',
+        'TRELLO_EMAIL': 'bench@example.com',
+        'TRELLO_PASSWORD': 'bench-password',
+        'TRELLO_HEADLESS': 'true',
+        'TRELLO_WATCH': 'false',
+        'TRELLO_EXTRACTION_ENGINE': args.engine,
+        'TRELLO_FULL_MEMBER_LIST': 'true' if args.overflow else 'false',
+        'HUGGINGFACE_API_KEY': 'bench-token',
+        'HF_INFERENCE_URL': f'{base_url}/generate',
+        'HF_STREAM': 'true' if args.stream else 'false',
+        'HF_LOCAL_WORKER': 'false',
+        'TRELLO_METRICS': 'trace',
+        'TRELLO_LOG_FORMAT': 'text',
+        'TRELLO_BROWSER_SERVER': 'true' if args.browser_server else 'false',
+        'TRELLO_ENRICH': 'true' if args.enrich else 'false',
+        'TRELLO_PROFILE_CACHE': 'false' if args.enrich_cold else 'true',
+        'TRELLO_BROWSER_SERVER_FILE': BROWSER_SERVER_FILE,
+    })
+    return env
+
+
+def run_scenario(members: int, args) -> Dict:
+    port = args.port or free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    server = start_fixture_server(port, members, args)
+    runs = []
+    try:
+        # One working directory per scenario: session, snapshots and cache persist across its runs
+        with tempfile.TemporaryDirectory(prefix='trello-e2e-') as workdir:
+            env = child_env(base_url, args)
+            for run in range(args.runs):
+                result_path = os.path.join(workdir, f'result-{run}.json')
+                before = server_stats(base_url)
+                # stdin answers the manual 2FA pause in login_to_trello
+                completed = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child', result_path],
+                    cwd=workdir, env=env, input='\n', capture_output=True, text=True, timeout=args.timeout
+                )
+                after = server_stats(base_url)
+                if completed.returncode != 0 or not os.path.exists(result_path):
+                    print(f"❌ Run {run + 1} failed:\n{completed.stderr[-2000:]}")
+                    runs.append({'run': run + 1, 'error': completed.stderr[-500:]})
+                    continue
+                with open(result_path) as f:
+                    result = json.load(f)
+                if not result['members']:
+                    print(f"❌ Run {run + 1} scraped no members:\n{completed.stdout[-2000:]}")
+                    runs.append({'run': run + 1, 'error': completed.stdout[-500:]})
+                    continue
+                result['run'] = run + 1
+                result['kind'] = 'cold' if run == 0 else 'warm'
+                result['http_requests'] = after['requests'] - before['requests']
+                result['inference_requests'] = after['generate_requests'] - before['generate_requests']
+                result['profile_requests'] = after['profile_requests'] - before['profile_requests']
+                result['profile_throttled'] = after['profile_throttled'] - before['profile_throttled']
+                if result['members'] != members:
+                    print(f"⚠️ Expected {members} members, scraped {result['members']}")
+                runs.append(result)
+                phases = ', '.join(f"{p} {s * 1000:.0f}ms" for p, s in result['phases_s'].items())
+                print(f"   run {run + 1} ({result['kind']}): {result['total_s']:.2f}s, "
+                      f"{result['members_per_s']} members/s, {result['python_peak_rss_mb']} MB | {phases}")
+    finally:
+        server.terminate()
+        server.wait()
+    return {'members': members, 'runs': runs}
+
+
+def parse_counts(spec: str) -> List[int]:
+    return [int(n) for n in spec.split(',') if n.strip()]
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        run_child(sys.argv[2])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', default='50,500', help='comma-separated board sizes')
+    parser.add_argument('--latency-ms', type=int, default=0, help='added to every fixture response')
+    parser.add_argument('--overflow', action='store_true', help='truncate the facepile so the member panel is used')
+    parser.add_argument('--facepile-size', type=int, default=10)
+    parser.add_argument('--engine', choices=['dom', 'network'], default='dom')
+    parser.add_argument('--stream', action='store_true', help='run with HF_STREAM=true')
+    parser.add_argument('--token-latency-ms', type=int, default=5)
+    parser.add_argument('--tokens', type=int, default=40)
+    parser.add_argument('--runs', type=int, default=2, help='first run is cold, the rest are warm')
+    parser.add_argument('--enrich', action='store_true', help='run the profile enrichment stage (TRELLO_ENRICH=true)')
+    parser.add_argument('--enrich-cold', action='store_true', help='disable the profile cache so every run fetches profiles')
+    parser.add_argument('--profile-rps', type=float, default=0, help='fixture throttles profile views above this rate')
+    parser.add_argument('--throttle-mode', choices=['status', 'page'], default='status')
+    parser.add_argument('--browser-server', action='store_true',
+                        help='connect to a persistent browser server (launched by the first run)')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    scenarios = []
+    try:
+        for members in parse_counts(args.members):
+            print(f"🧪 {members} members, {args.latency_ms}ms latency, engine={args.engine}, overflow={args.overflow}")
+            scenarios.append(run_scenario(members, args))
+    finally:
+        if args.browser_server:
+            subprocess.run([sys.executable, os.path.join(REPO_ROOT, 'browser_server.py'), 'stop'],
+                           env=dict(os.environ, TRELLO_BROWSER_SERVER_FILE=BROWSER_SERVER_FILE),
+                           stdout=subprocess.DEVNULL)
+
+    results = {
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'port', 'timeout')},
+        'python': sys.version.split()[0],
+        'scenarios': scenarios,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if any('error' in run for scenario in scenarios for run in scenario['runs']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
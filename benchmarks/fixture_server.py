@@ -0,0 +1,287 @@
+"""Synthetic Trello + inference stand-in for offline benchmarks.
+
+Serves login/home/board pages with the same data-testid hooks that
+browser_actions.py targets, board JSON payloads like the ones the Trello web
+app fetches, member profile pages (optionally throttled) for the enrichment
+stage, and a TGI-compatible text-generation endpoint for TrelloAgent.
+
+    python benchmarks/fixture_server.py --port 8765 --members 500 --latency-ms 50 --overflow
+    python benchmarks/fixture_server.py --profile-rps 5 --throttle-mode page
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from typing import Dict
+
+from aiohttp import web
+
+SESSION_COOKIE = 'bench_session'
+
+LOGIN_HTML = """<!doctype html>
+<html><body>
+<form onsubmit="return false">
+  <input data-testid="username" name="username">
+  <div id="pw" style="display:none"><input id="password" type="password"></div>
+  <button id="login-submit" type="button">Continue</button>
+</form>
+<script>
+document.getElementById('login-submit').addEventListener('click', async () => {
+  const pw = document.getElementById('pw');
+  if (pw.style.display === 'none') { pw.style.display = 'block'; return; }
+  await fetch('/session', {method: 'POST'});
+  location.href = '/';
+});
+</script>
+</body></html>"""
+
+HOME_HTML = """<!doctype html>
+<html><body>
+<button data-testid="header-member-menu-button">Me</button>
+<h1>Boards</h1>
+</body></html>"""
+
+# The board renders its facepile from the board JSON, like the real web app.
+# The full member list is virtualized: only rows in view exist in the DOM.
+BOARD_HTML = """<!doctype html>
+<html><head><style>
+  #list { height: 320px; overflow-y: auto; position: relative; margin: 0; padding: 0; }
+  #list li { position: absolute; left: 0; right: 0; height: 32px; list-style: none; }
+</style></head><body>
+<button data-testid="header-member-menu-button">Me</button>
+<div class="board-header">
+  <h1 data-testid="board-name-display">__NAME__</h1>
+  <div id="facepile"></div>
+  <button data-testid="board-share-button">Share</button>
+</div>
+<div id="dialog" role="dialog" style="display:none">
+  <ul id="list" data-testid="board-members-list"><div id="spacer"></div></ul>
+</div>
+<script>
+const FACEPILE_SIZE = __FACEPILE__;
+const OVERFLOW = __OVERFLOW__;
+const ROW = 32;
+let members = [];
+
+function renderRows() {
+  const list = document.getElementById('list');
+  const first = Math.max(0, Math.floor(list.scrollTop / ROW) - 2);
+  const last = Math.min(members.length, first + Math.ceil(list.clientHeight / ROW) + 4);
+  list.querySelectorAll('li').forEach(li => li.remove());
+  for (let i = first; i < last; i++) {
+    const li = document.createElement('li');
+    li.setAttribute('data-testid', 'board-member-list-item');
+    li.style.top = (i * ROW) + 'px';
+    li.innerHTML = '<span></span><br><span></span>';
+    li.children[0].textContent = members[i].fullName;
+    li.children[2].textContent = '@' + members[i].username;
+    list.appendChild(li);
+  }
+}
+
+function openMembers() {
+  document.getElementById('dialog').style.display = 'block';
+  document.getElementById('spacer').style.height = (members.length * ROW) + 'px';
+  renderRows();
+}
+
+document.getElementById('list').addEventListener('scroll', renderRows);
+document.querySelector('[data-testid="board-share-button"]').addEventListener('click', openMembers);
+document.addEventListener('keydown', e => {
+  if (e.key === 'Escape') document.getElementById('dialog').style.display = 'none';
+});
+
+fetch('/1/boards/__BOARD_ID__?members=all&memberships=all')
+  .then(r => r.json())
+  .then(board => {
+    members = board.members;
+    const facepile = document.getElementById('facepile');
+    const shown = OVERFLOW ? members.slice(0, FACEPILE_SIZE) : members;
+    for (const m of shown) {
+      const el = document.createElement('div');
+      el.setAttribute('data-testid', 'board-facepile-member');
+      el.title = m.fullName + ' (' + m.username + ')';
+      facepile.appendChild(el);
+    }
+    if (OVERFLOW && members.length > FACEPILE_SIZE) {
+      const more = document.createElement('button');
+      more.setAttribute('data-testid', 'board-facepile-overflow');
+      more.textContent = '+' + (members.length - FACEPILE_SIZE);
+      more.addEventListener('click', openMembers);
+      facepile.appendChild(more);
+    }
+  });
+</script>
+</body></html>"""
+
+PROFILE_HTML = """<!doctype html>
+<html><body>
+<button data-testid="header-member-menu-button">Me</button>
+<div data-testid="profile-header">
+  <h1>__NAME__</h1><span>@__USERNAME__</span>__EMAIL__
+</div>
+<ul data-testid="member-activity">
+  <li><time datetime="__ACTIVE__">__ACTIVE__</time> commented on a card</li>
+</ul>
+</body></html>"""
+
+# What a throttled user sees when the site answers 200 with an interstitial instead of a 429
+THROTTLE_HTML = """<!doctype html>
+<html><body><h1>Too many requests</h1><p>Please wait a moment and try again.</p></body></html>"""
+
+ANALYSIS_TEXT = (
+    "Team composition: the board has a single member role. Data quality: email and "
+    "activity data are unavailable on the free tier. Security: enable two-factor "
+    "authentication and run regular access reviews. User management: review inactive "
+    "members and standardize naming."
+)
+
+
+def synthetic_board(board_id: str, count: int) -> Dict:
+    members = [{'id': f'{board_id}-{i}', 'fullName': f'Bench Member {i}', 'username': f'bench{i}'}
+               for i in range(count)]
+    memberships = [{'idMember': m['id'], 'memberType': 'admin' if i == 0 else 'normal'}
+                   for i, m in enumerate(members)]
+    return {'id': board_id, 'name': f'Bench {board_id}', 'members': members, 'memberships': memberships}
+
+
+def create_app(members: int = 50, latency_ms: int = 0, overflow: bool = False, facepile_size: int = 10,
+               token_latency_ms: int = 5, tokens: int = 40, profile_rps: float = 0,
+               throttle_mode: str = 'status', profile_latency_ms: int = 0) -> web.Application:
+    latency = latency_ms / 1000
+    stats = {'requests': 0, 'generate_requests': 0, 'profile_requests': 0, 'profile_throttled': 0}
+    profile_window = deque()
+
+    @web.middleware
+    async def add_latency(request, handler):
+        stats['requests'] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        return await handler(request)
+
+    def logged_in(request) -> bool:
+        return request.cookies.get(SESSION_COOKIE) == '1'
+
+    async def login(request):
+        return web.Response(text=LOGIN_HTML, content_type='text/html')
+
+    async def create_session(request):
+        response = web.json_response({'ok': True})
+        response.set_cookie(SESSION_COOKIE, '1', max_age=3600)
+        return response
+
+    async def home(request):
+        if not logged_in(request):
+            raise web.HTTPFound('/login')
+        return web.Response(text=HOME_HTML, content_type='text/html')
+
+    async def board_page(request):
+        if not logged_in(request):
+            raise web.HTTPFound('/login')
+        board_id = request.match_info['board_id']
+        html = (BOARD_HTML.replace('__NAME__', f'Bench {board_id}')
+                .replace('__BOARD_ID__', board_id)
+                .replace('__FACEPILE__', str(facepile_size))
+                .replace('__OVERFLOW__', 'true' if overflow else 'false'))
+        return web.Response(text=html, content_type='text/html')
+
+    async def board_json(request):
+        if not logged_in(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        return web.json_response(synthetic_board(request.match_info['board_id'], members))
+
+    async def board_members_json(request):
+        if not logged_in(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        return web.json_response(synthetic_board(request.match_info['board_id'], members)['members'])
+
+    async def profile_page(request):
+        """bench<i> profiles: every third shows an email; more than profile_rps per second get throttled"""
+        if not logged_in(request):
+            raise web.HTTPFound('/login')
+        stats['profile_requests'] += 1
+        if profile_rps:
+            now = time.monotonic()
+            while profile_window and now - profile_window[0] > 1:
+                profile_window.popleft()
+            if len(profile_window) >= profile_rps:
+                stats['profile_throttled'] += 1
+                if throttle_mode == 'page':
+                    return web.Response(text=THROTTLE_HTML, content_type='text/html')
+                return web.Response(text=THROTTLE_HTML, content_type='text/html', status=429,
+                                    headers={'Retry-After': '1'})
+            profile_window.append(now)
+        if profile_latency_ms:
+            await asyncio.sleep(profile_latency_ms / 1000)
+        match = re.fullmatch(r'bench(\d+)', request.match_info['username'])
+        if not match or int(match.group(1)) >= members:
+            raise web.HTTPNotFound()
+        i = int(match.group(1))
+        email = (f'<a data-testid="profile-email" href="mailto:bench{i}@example.com">bench{i}@example.com</a>'
+                 if i % 3 == 0 else '')
+        html = (PROFILE_HTML.replace('__NAME__', f'Bench Member {i}')
+                .replace('__USERNAME__', f'bench{i}')
+                .replace('__EMAIL__', email)
+                .replace('__ACTIVE__', f'2026-01-{i % 28 + 1:02d}T12:00:00Z'))
+        return web.Response(text=html, content_type='text/html')
+
+    async def generate(request):
+        """TGI-style text generation: JSON, or server-sent events when stream=true"""
+        stats['generate_requests'] += 1
+        body = await request.json()
+        max_tokens = min(tokens, int(body.get('parameters', {}).get('max_new_tokens', tokens)))
+        words = (ANALYSIS_TEXT.split(' ') * (max_tokens // len(ANALYSIS_TEXT.split(' ')) + 1))[:max_tokens]
+        if not body.get('stream'):
+            await asyncio.sleep(max_tokens * token_latency_ms / 1000)
+            return web.json_response([{'generated_text': ' '.join(words)}])
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        for i, word in enumerate(words):
+            await asyncio.sleep(token_latency_ms / 1000)
+            event = {'token': {'id': i, 'text': (' ' if i else '') + word, 'special': False}}
+            await response.write(f"data:{json.dumps(event)}\n\n".encode())
+        return response
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application(middlewares=[add_latency])
+    app.router.add_get('/login', login)
+    app.router.add_post('/session', create_session)
+    app.router.add_get('/', home)
+    app.router.add_get('/b/{board_id}', board_page)
+    app.router.add_get('/b/{board_id}/{name}', board_page)
+    app.router.add_get('/1/boards/{board_id}', board_json)
+    app.router.add_get('/1/boards/{board_id}/members', board_members_json)
+    app.router.add_get('/u/{username}', profile_page)
+    app.router.add_get('/u/{username}/activity', profile_page)
+    app.router.add_post('/generate', generate)
+    app.router.add_get('/__stats', get_stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--latency-ms', type=int, default=0, help='added to every response')
+    parser.add_argument('--overflow', action='store_true', help='truncate the facepile with a "+N" button')
+    parser.add_argument('--facepile-size', type=int, default=10)
+    parser.add_argument('--token-latency-ms', type=int, default=5)
+    parser.add_argument('--tokens', type=int, default=40)
+    parser.add_argument('--profile-rps', type=float, default=0, help='throttle profile views above this rate (0: never)')
+    parser.add_argument('--throttle-mode', choices=['status', 'page'], default='status',
+                        help='throttle with a 429 + Retry-After, or a 200 "Too many requests" page')
+    parser.add_argument('--profile-latency-ms', type=int, default=0)
+    args = parser.parse_args()
+    app = create_app(args.members, args.latency_ms, args.overflow, args.facepile_size,
+                     args.token_latency_ms, args.tokens, args.profile_rps, args.throttle_mode,
+                     args.profile_latency_ms)
+    web.run_app(app, host=args.host, port=args.port, print=lambda *_: print(f"🧪 Fixture server on http://{args.host}:{args.port}", flush=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Throughput benchmark for the batched local inference worker.
+
+Starts `local_worker.py` with a tiny randomly initialized model (CPU is fine),
+sends prompts at several concurrency levels and reports prompts/sec.
+
+    python benchmarks/local_worker_benchmark.py --prompts 64 --concurrency 1 4 16 [--quantize]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from local_worker import LocalWorkerClient  # noqa: E402
+
+
+async def measure(client: LocalWorkerClient, prompts: int, concurrency: int, params: dict) -> float:
+    """Prompts/sec for `prompts` requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await client.generate(f"Analyze this Trello team data: member {i}", **params)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(prompts)))
+    return prompts / (time.perf_counter() - start)
+
+
+async def run(args):
+    socket_path = os.path.join(tempfile.mkdtemp(), 'worker.sock')
+    command = [sys.executable, os.path.join(REPO_ROOT, 'local_worker.py'), '--model', args.model,
+               '--socket', socket_path, '--max-batch', str(args.max_batch)]
+    if args.quantize:
+        command.append('--quantize')
+    worker = subprocess.Popen(command)
+    client = LocalWorkerClient(args.model, socket_path=socket_path)
+    params = {'max_new_tokens': args.max_new_tokens, 'do_sample': False}
+    results = {'model': args.model, 'quantize': args.quantize, 'max_batch': args.max_batch, 'throughput': {}}
+    try:
+        deadline = time.monotonic() + 300
+        while not await client.is_running():
+            if worker.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("worker failed to start")
+            await asyncio.sleep(0.2)
+
+        await measure(client, 2, 1, params)  # warm-up
+        for concurrency in args.concurrency:
+            rate = await measure(client, args.prompts, concurrency, params)
+            results['throughput'][str(concurrency)] = round(rate, 2)
+            print(f"⚡ concurrency {concurrency:3d}: {rate:8.2f} prompts/sec")
+        results['worker'] = await client.stats()
+        print(f"📦 Worker stats: {results['worker']}")
+    finally:
+        worker.terminate()
+        worker.wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default='hf-internal-testing/tiny-random-gpt2')
+    parser.add_argument('--prompts', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--max-new-tokens', type=int, default=16)
+    parser.add_argument('--quantize', action='store_true')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Memory and load-time benchmark: member dicts vs compact MemberRecords, CSV vs Parquet.
+
+Each measurement runs in a fresh interpreter so string interning and allocator
+state from one variant cannot flatter another.
+
+    python benchmarks/member_record_benchmark.py --members 100000 --output records.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import csv, json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+from member_record import read_members_csv, read_members_parquet
+
+variant, path, mode = sys.argv[1], sys.argv[2], sys.argv[3]
+if mode == 'memory':
+    tracemalloc.start()
+started = time.perf_counter()
+if variant == 'csv_dicts':
+    with open(path, newline='') as f:
+        members = list(csv.DictReader(f))
+elif variant == 'csv_records':
+    members = read_members_csv(path)
+elif variant == 'parquet_records':
+    members = read_members_parquet(path)
+elif variant == 'parquet_admins':
+    members = read_members_parquet(path, role='Admin')
+elapsed = time.perf_counter() - started
+current = tracemalloc.get_traced_memory()[0] if mode == 'memory' else None
+print(json.dumps({{'members': len(members), 'load_s': elapsed, 'bytes': current}}))
+"""
+
+
+def write_fixture(directory: str, count: int) -> dict:
+    sys.path.insert(0, REPO_ROOT)
+    from member_extraction import build_member
+    from output_writers import MemberWriter
+
+    with MemberWriter(directory, jsonl=False, parquet=True) as writer:
+        for i in range(count):
+            member = build_member(f'Member Name {i}', f'user{i}')
+            if i % 50 == 0:
+                member['role'] = 'Admin'
+            writer.write(member)
+    paths = {'csv': writer.csv_path}
+    if writer.parquet_path:
+        paths['parquet'] = writer.parquet_path
+    return paths
+
+
+def probe(variant: str, path: str, mode: str) -> dict:
+    result = subprocess.run([sys.executable, '-c', PROBE.format(root=REPO_ROOT), variant, path, mode],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=100000)
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    results = {'members': args.members, 'variants': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_fixture(directory, args.members)
+        variants = [('csv_dicts', 'csv'), ('csv_records', 'csv')]
+        if 'parquet' in paths:
+            variants += [('parquet_records', 'parquet'), ('parquet_admins', 'parquet')]
+        else:
+            print("⚠️ pyarrow is not installed, skipping Parquet variants")
+        for variant, kind in variants:
+            # Timed without tracemalloc, which slows allocation-heavy code unevenly
+            stats = probe(variant, paths[kind], 'time')
+            stats['bytes'] = probe(variant, paths[kind], 'memory')['bytes']
+            stats['bytes_per_member'] = round(stats['bytes'] / max(1, args.members), 1)
+            stats['file_bytes'] = os.path.getsize(paths[kind])
+            results['variants'][variant] = stats
+            print(f"{variant:16} {stats['members']:>9} members  {stats['load_s'] * 1000:8.1f}ms  "
+                  f"{stats['bytes_per_member']:7.1f} B/member  file {stats['file_bytes'] / 1e6:.1f} MB")
+
+    baseline = results['variants']['csv_dicts']['bytes']
+    compact = results['variants']['csv_records']['bytes']
+    print(f"📉 Records use {baseline / compact:.1f}x less memory than CSV-loaded dicts")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
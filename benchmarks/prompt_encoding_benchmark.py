@@ -0,0 +1,54 @@
+"""Token-count report for the member block of analysis prompts under each encoding.
+
+Counts use the model's tokenizer (HF_MODEL_NAME, or --model); if it cannot be
+loaded the counts are estimated at ~4 characters per token and marked as such.
+
+    python benchmarks/prompt_encoding_benchmark.py --sizes 10 100 1000 --output prompts.json
+"""
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from prompt_encoding import compare_encodings, estimate_tokens, load_token_counter  # noqa: E402
+from report_benchmark import synthetic_members  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--model', default=os.getenv('HF_MODEL_NAME', 'microsoft/DialoGPT-medium'))
+    parser.add_argument('--budget', type=int, default=int(os.getenv('HF_CHUNK_TOKENS', '1500')),
+                        help='token budget per batch, to report members per prompt')
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    try:
+        count_tokens = load_token_counter(args.model)
+        tokenizer = args.model
+    except Exception as e:
+        print(f"⚠️ Could not load tokenizer for {args.model}, estimating (~4 chars/token): {str(e).splitlines()[0]}")
+        count_tokens = estimate_tokens
+        tokenizer = 'estimate'
+
+    results = {'tokenizer': tokenizer, 'budget': args.budget, 'sizes': {}}
+    for size in args.sizes:
+        report = compare_encodings(synthetic_members(size), count_tokens)
+        results['sizes'][size] = report
+        print(f"\n👥 {size} members (tokenizer: {tokenizer})")
+        for name, stats in report.items():
+            per_prompt = int(args.budget / stats['tokens_per_member']) if stats['tokens_per_member'] else 0
+            print(f"  {name:13} {stats['tokens']:>9} tokens  {stats['tokens_per_member']:6.2f}/member  "
+                  f"{stats['vs_json'] * 100:5.1f}% of json  ~{per_prompt} members per {args.budget}-token batch")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Import-time and RSS benchmark for the CLI startup path.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, reports the
+slowest imports, peak RSS, and whether any heavy dependency was pulled in.
+Exits non-zero when a budget is exceeded so startup regressions are caught.
+
+    python benchmarks/startup_benchmark.py --max-ms 1500 --max-rss-mb 150 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only load on the local-model / DataFrame code paths
+HEAVY_MODULES = ['torch', 'transformers', 'pandas', 'accelerate']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def run_importtime(module: str) -> List[Dict]:
+    """Per-module self/cumulative import times (microseconds) for `import module`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append({
+                'module': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': len(match.group(3)) // 2,
+            })
+    return entries
+
+
+def run_probe(module: str) -> Dict:
+    """Wall time, peak RSS and heavy modules loaded by `import module` in a fresh process"""
+    code = (
+        "import sys, time, resource\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(elapsed, rss, ','.join(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    elapsed, rss, heavy = (result.stdout.strip().splitlines()[-1].split(' ') + [''])[:3]
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_mb = int(rss) / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return {'import_ms': float(elapsed), 'peak_rss_mb': rss_mb, 'heavy_modules': [m for m in heavy.split(',') if m]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='main', help='module to import (default: main)')
+    parser.add_argument('--runs', type=int, default=5, help='fresh-interpreter runs to take the median of')
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to list')
+    parser.add_argument('--max-ms', type=float, help='fail if median import time exceeds this')
+    parser.add_argument('--max-rss-mb', type=float, help='fail if median peak RSS exceeds this')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    probes = [run_probe(args.module) for _ in range(args.runs)]
+    entries = run_importtime(args.module)
+    slowest = sorted(entries, key=lambda e: e['self_us'], reverse=True)[:args.top]
+    top_level = [e for e in entries if e['depth'] == 0]
+
+    results = {
+        'module': args.module,
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'import_ms_median': statistics.median(p['import_ms'] for p in probes),
+        'peak_rss_mb_median': statistics.median(p['peak_rss_mb'] for p in probes),
+        'importtime_total_ms': sum(e['cumulative_us'] for e in top_level) / 1000,
+        'heavy_modules_loaded': sorted({m for p in probes for m in p['heavy_modules']}),
+        'slowest_imports': slowest,
+    }
+
+    print(f"⏱️ import {args.module}: {results['import_ms_median']:.1f}ms median over {args.runs} run(s)")
+    print(f"🧠 Peak RSS: {results['peak_rss_mb_median']:.1f} MB")
+    print(f"📦 Heavy modules loaded: {', '.join(results['heavy_modules_loaded']) or 'none'}")
+    print("🐢 Slowest imports (self time):")
+    for entry in slowest:
+        print(f"  {entry['self_us'] / 1000:8.1f}ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+    failures = []
+    if results['heavy_modules_loaded']:
+        failures.append(f"heavy modules imported at startup: {', '.join(results['heavy_modules_loaded'])}")
+    if args.max_ms is not None and results['import_ms_median'] > args.max_ms:
+        failures.append(f"import time {results['import_ms_median']:.1f}ms > {args.max_ms}ms")
+    if args.max_rss_mb is not None and results['peak_rss_mb_median'] > args.max_rss_mb:
+        failures.append(f"peak RSS {results['peak_rss_mb_median']:.1f}MB > {args.max_rss_mb}MB")
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,31 @@
 import asyncio
+import re
 from playwright.async_api import async_playwright
 import os
 import time
 import csv
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator, Tuple
+from session_store import SessionStore
+from browser_server import BrowserServer
+from readiness import Readiness
+from member_extraction import FACEPILE_MEMBER, extract_facepile, extract_member_panel, member_key
+from network_capture import MemberCapture, block_heavy_resources
+from member_enrichment import ProfileEnricher
+from telemetry import get_logger, telemetry
+
+log = get_logger('browser')
+
+
+def board_slug(board_url: str) -> str:
+    """Short, filesystem-safe identifier for a board URL (the /b/<id> part)"""
+    match = re.search(r'/b/([^/?#]+)', board_url)
+    if match:
+        return match.group(1)
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', board_url).strip('_') or 'board'
+
 
 class TrelloBrowserActions:
-    def __init__(self):
+    def __init__(self, board_urls: Optional[List[str]] = None, pool_size: Optional[int] = None):
         self.browser = None
         self.context = None
         self.page = None
@@ -14,61 +33,147 @@ class TrelloBrowserActions:
         self.password = os.getenv('TRELLO_PASSWORD')
         self.board_url = os.getenv('TRELLO_BOARD_URL')
         
+        # Multi-board mode: explicit list, or comma-separated TRELLO_BOARD_URLS
+        if board_urls is None:
+            board_urls = [u.strip() for u in os.getenv('TRELLO_BOARD_URLS', '').split(',') if u.strip()]
+        if not board_urls and self.board_url:
+            board_urls = [self.board_url]
+        self.board_urls = board_urls
+        if not self.board_url and self.board_urls:
+            self.board_url = self.board_urls[0]
+        self.pool_size = pool_size or int(os.getenv('TRELLO_POOL_SIZE', '4'))
+        
         if not self.email or not self.password:
             raise ValueError("Please set TRELLO_EMAIL and TRELLO_PASSWORD in your .env file")
         
         if not self.board_url:
-            raise ValueError("Please set TRELLO_BOARD_URL in your .env file")
+            raise ValueError("Please set TRELLO_BOARD_URL (or TRELLO_BOARD_URLS) in your .env file")
+        
+        # Saved login so restarts can skip the credential + 2FA flow
+        self.session_store = SessionStore() if os.getenv('TRELLO_PERSIST_SESSION', 'true').lower() != 'false' else None
+        self.session_restored = False
+        
+        # Event-driven waits with per-step latency budgets (fast/conservative)
+        self.readiness = Readiness()
+        
+        # Always read the full member panel, not just the facepile
+        self.full_member_list = os.getenv('TRELLO_FULL_MEMBER_LIST', 'false').lower() == 'true'
+        
+        # Extraction engine: 'dom' reads the rendered facepile, 'network' reads the
+        # board JSON the web app fetches (with heavy resources blocked)
+        self.engine = os.getenv('TRELLO_EXTRACTION_ENGINE', 'dom').lower()
+        if self.engine not in ('dom', 'network'):
+            raise ValueError("TRELLO_EXTRACTION_ENGINE must be 'dom' or 'network'")
+        self.headless = os.getenv('TRELLO_HEADLESS', 'true' if self.engine == 'network' else 'false').lower() == 'true'
+        self.base_url = os.getenv('TRELLO_BASE_URL', 'https://trello.com').rstrip('/')
+        
+        # Connect to a persistent browser server shared across runs instead of launching Firefox each time
+        self.browser_server = BrowserServer(headless=self.headless) if os.getenv('TRELLO_BROWSER_SERVER', 'false').lower() == 'true' else None
+        
+        # Fill email/last_login from member profile pages after scraping
+        self.enrich = os.getenv('TRELLO_ENRICH', 'false').lower() == 'true'
+        self.enricher = None
     
+    @telemetry.traced('setup_browser')
     async def setup_browser(self):
         """Initialize browser with stealth settings"""
-        print("🌐 Setting up browser...")
+        log.info("🌐 Setting up browser...")
         playwright = await async_playwright().start()
         
+        # Reuse the persistent browser server if enabled (contexts are per connection,
+        # so the login carries over through the saved session below)
+        if self.browser_server:
+            try:
+                self.browser, reused = await self.browser_server.connect(playwright)
+                log.info("♻️ Connected to running browser server" if reused else "🟢 Connected to new browser server")
+            except Exception as e:
+                log.warning(f"⚠️ Browser server unavailable, launching Firefox directly: {str(e)}")
+        
         # Launch browser with stealth settings
-        self.browser = await playwright.firefox.launch(
-            headless=False
-        )
+        if not self.browser:
+            self.browser = await playwright.firefox.launch(
+                headless=self.headless
+            )
+        
+        # Restore a previously saved login, if any
+        storage_state = self.session_store.load() if self.session_store else None
+        self.session_restored = storage_state is not None
         
         # Create context with realistic settings
         self.context = await self.browser.new_context(
             viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            storage_state=storage_state
         )
         
-        self.page = await self.context.new_page()
-        
-        # Add stealth scripts
-        await self.page.add_init_script("""
+        # Add stealth scripts (on the context so every pooled page gets them)
+        await self.context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined,
             });
         """)
+        
+        if self.engine == 'network':
+            await block_heavy_resources(self.context)
+        
+        self.page = await self.context.new_page()
+    
+    @telemetry.traced('session_probe')
+    async def is_logged_in(self) -> bool:
+        """Cheap session probe: is the header member menu rendered?"""
+        try:
+            await self.page.goto(f'{self.base_url}/', wait_until='domcontentloaded')
+            await self.readiness.wait_for_selector(self.page, 'session_probe', '[data-testid="header-member-menu-button"]')
+            return True
+        except Exception:
+            return False
     
+    async def ensure_logged_in(self) -> bool:
+        """Reuse the restored session when it is still valid, else run the full login"""
+        if self.session_restored:
+            if await self.is_logged_in():
+                log.info("✅ Restored saved Trello session")
+                return True
+            log.warning("⚠️ Saved session expired, logging in again...")
+            self.session_store.clear()
+        
+        if not await self.login_to_trello():
+            return False
+        await self.save_session()
+        return True
+    
+    async def save_session(self):
+        """Persist the current context's storage state"""
+        if not self.session_store:
+            return
+        try:
+            self.session_store.save(await self.context.storage_state())
+            log.info("🔑 Saved Trello session for next run")
+        except Exception as e:
+            log.warning(f"⚠️ Could not save session: {str(e)}")
+    
+    @telemetry.traced('login')
     async def login_to_trello(self) -> bool:
         """Login to Trello with email and password"""
         try:
-            print("🔐 Logging into Trello...")
+            log.info("🔐 Logging into Trello...")
             
             # Navigate to Trello login page
-            await self.page.goto('https://trello.com/login', wait_until='networkidle')
-            await self.page.wait_for_timeout(2000)
+            await self.page.goto(f'{self.base_url}/login', wait_until='domcontentloaded')
             
             # Enter email
-            email_input = await self.page.wait_for_selector('[data-testid="username"]', timeout=30000)
+            email_input = await self.readiness.wait_for_selector(self.page, 'login_page', '[data-testid="username"]')
             await email_input.fill(self.email)
             
             # Click continue
             await self.page.click('#login-submit')
-            await self.page.wait_for_timeout(2000)
             
-            # Enter password
-            password_input = await self.page.wait_for_selector('#password', timeout=30000)
+            # Enter password (appears once the email step has been accepted)
+            password_input = await self.readiness.wait_for_selector(self.page, 'password_form', '#password')
             await password_input.fill(self.password)
             
             # Submit login
             await self.page.click('#login-submit')
-            await self.page.wait_for_timeout(3000)
 
             # Always pause for manual 2FA/verification
             print("\nIf you see a 2FA/verification code prompt in the browser, please enter the code now.")
@@ -77,119 +182,241 @@ class TrelloBrowserActions:
 
             # Wait for login to complete
             try:
-                await self.page.wait_for_selector('[data-testid="header-member-menu-button"]', timeout=10000)
-                print("✅ Successfully logged into Trello!")
+                await self.readiness.wait_for_selector(self.page, 'login_complete', '[data-testid="header-member-menu-button"]')
+                log.info("✅ Successfully logged into Trello!")
                 return True
             except:
-                print("❌ Login failed - unknown error")
+                log.error("❌ Login failed - unknown error")
                 return False
                     
         except Exception as e:
-            print(f"❌ Login error: {str(e)}")
+            log.error(f"❌ Login error: {str(e)}")
             return False
     
-    async def navigate_to_team_board(self) -> bool:
-        """Navigate to the specific Trello board"""
-        try:
-            print(f"📋 Navigating to board: {self.board_url}")
-            
-            # Navigate directly to the specified board URL
-            await self.page.goto(self.board_url, wait_until='networkidle')
-            await self.page.wait_for_timeout(3000)
-            
-            # Check if we successfully loaded the board
+    async def navigate_to_team_board(self, page=None, board_url: Optional[str] = None, reload: bool = False) -> bool:
+        """Navigate to the specific Trello board (or just reload it if `page` is already there)"""
+        page = page or self.page
+        board_url = board_url or self.board_url
+        with telemetry.span('navigate', board=board_slug(board_url)):
             try:
-                # Wait for board content to load
-                await self.page.wait_for_selector('[data-testid="board-name-display"]', timeout=10000)
-                print("✅ Successfully navigated to board!")
-                return True
-            except:
-                # Alternative check - look for board header
+                # Navigate directly to the specified board URL. Trello long-polls, so
+                # 'networkidle' rarely settles; wait for the board header instead.
+                if reload and board_slug(page.url) == board_slug(board_url):
+                    log.info(f"🔄 Reloading board: {board_url}")
+                    await page.reload(wait_until='domcontentloaded')
+                else:
+                    log.info(f"📋 Navigating to board: {board_url}")
+                    await page.goto(board_url, wait_until='domcontentloaded')
+                
+                # Check if we successfully loaded the board (new or legacy header)
                 try:
-                    await self.page.wait_for_selector('.board-header', timeout=5000)
-                    print("✅ Successfully navigated to board!")
+                    await self.readiness.wait_for_selector(
+                        page, 'board', '[data-testid="board-name-display"], .board-header', label=board_slug(board_url)
+                    )
+                    log.info("✅ Successfully navigated to board!")
                     return True
                 except:
-                    print("❌ Could not access board. Please check:")
-                    print("1. Board URL is correct")
-                    print("2. You have access to this board")
-                    print("3. Board is not private/restricted")
+                    log.error("❌ Could not access board. Please check:")
+                    log.error("1. Board URL is correct")
+                    log.error("2. You have access to this board")
+                    log.error("3. Board is not private/restricted")
                     return False
-            
-        except Exception as e:
-            print(f"❌ Navigation error: {str(e)}")
-            return False
+                
+            except Exception as e:
+                log.error(f"❌ Navigation error: {str(e)}")
+                return False
     
     async def scrape_members(self) -> List[Dict]:
         """Scrape member data from Trello board"""
+        return [member async for member in self.stream_members()]
+    
+    async def stream_members(self) -> AsyncIterator[Dict]:
+        """Log in and yield the configured board's members as they are extracted"""
         await self.setup_browser()
         
-        if not await self.login_to_trello():
-            return []
-        
-        if not await self.navigate_to_team_board():
-            return []
+        if not await self.ensure_logged_in():
+            return
         
+        async for member in self.iter_board_members(self.page, self.board_url):
+            yield member
+        log.info(self.readiness.summary())
+    
+    async def scrape_board(self, page, board_url: str, reload: bool = False) -> List[Dict]:
+        """Navigate `page` to one board and extract its members with the configured engine"""
+        return [member async for member in self.iter_board_members(page, board_url, reload=reload)]
+    
+    async def iter_board_members(self, page, board_url: str, reload: bool = False) -> AsyncIterator[Dict]:
+        """Navigate `page` to one board and yield its members with the configured engine"""
+        slug = board_slug(board_url)
+        capture = MemberCapture(page) if self.engine == 'network' else None
+        extraction_started = None
+        count = 0
         try:
-            print("👥 Scraping member data...")
+            if not await self.navigate_to_team_board(page, board_url, reload=reload):
+                return
             
-            # Wait for the board to fully load
-            await self.page.wait_for_timeout(3000)
+            extraction_started = time.perf_counter()
+            if capture:
+                members = await capture.wait(self.readiness.timeout('response'))
+                self.readiness.record('response', extraction_started, bool(members), slug)
+                if members:
+                    log.info(f"📡 Read {len(members)} member(s) from {capture.payloads_seen} board payload(s) ({capture.bytes_received} bytes)")
+                    for member in members:
+                        count += 1
+                        yield member
+                    return
+                log.warning("⚠️ No usable board payload seen, falling back to DOM extraction")
             
-            # Use the selector for facepile members
-            facepile_members = await self.page.locator('[data-testid="board-facepile-member"]').all()
-            print(f"🔍 Found {len(facepile_members)} facepile member(s) on the board")
-
-            members = []
-            for member_elem in facepile_members:
+            async for member in self.iter_extracted_members(page):
+                count += 1
+                yield member
+        finally:
+            if capture:
+                capture.detach()
+            # An async generator cannot hold a span across yields, so record the duration directly
+            if extraction_started is not None:
+                telemetry.observe('extraction', time.perf_counter() - extraction_started, board=slug)
+                telemetry.inc('members_scraped_total', count, board=slug)
+    
+    async def extract_members(self, page=None) -> List[Dict]:
+        """Extract member data from a board that is already loaded in `page`"""
+        return [member async for member in self.iter_extracted_members(page)]
+    
+    async def iter_extracted_members(self, page=None) -> AsyncIterator[Dict]:
+        """Yield members from a loaded board: the facepile first, then any the member panel adds"""
+        page = page or self.page
+        seen = set()
+        try:
+            log.info("👥 Scraping member data...")
+            
+            # Wait for the facepile to render and stop changing
+            try:
+                label = board_slug(page.url)
+                await self.readiness.wait_for_selector(page, 'members', FACEPILE_MEMBER, label=label, state='attached')
+                await self.readiness.wait_for_dom_quiet(page, 'members_settled', FACEPILE_MEMBER, label=label)
+            except Exception:
+                log.warning("⚠️ Facepile did not render in time")
+            
+            # Read every facepile member in a single round trip
+            members, overflow = await extract_facepile(page)
+            log.info(f"🔍 Found {len(members)} facepile member(s) on the board")
+            for member in members:
+                seen.add(member_key(member))
+                log.info(f"✅ Found member: {member['name']} ({member['username']})")
+                yield member
+            
+            # The facepile truncates large boards with "+N"; read the full panel instead
+            if overflow or self.full_member_list:
+                if overflow:
+                    log.info(f"➕ Facepile hides {overflow} more member(s), opening member list...")
                 try:
-                    title = await member_elem.get_attribute('title')
-                    if title:
-                        if '(' in title and ')' in title:
-                            name = title.split('(')[0].strip()
-                            username = title.split('(')[1].split(')')[0].strip()
-                        else:
-                            name = title.strip()
-                            username = "Unknown"
-                        members.append({
-                            'name': name,
-                            'username': username,
-                            'email': 'Not available in free tier',
-                            'role': 'Member',
-                            'last_login': 'Not available in free tier'
-                        })
-                        print(f"✅ Found member: {name} ({username})")
+                    panel_members = await extract_member_panel(page, timeout=self.readiness.timeout('members'))
                 except Exception as e:
-                    print(f"⚠️ Error extracting member data: {str(e)}")
-                    continue
+                    panel_members = None
+                    log.warning(f"⚠️ Error reading board member list: {str(e)}")
+                if panel_members is None:
+                    log.warning("⚠️ Could not open the board member list")
+                for member in panel_members or []:
+                    if member_key(member) in seen:
+                        continue
+                    seen.add(member_key(member))
+                    log.info(f"✅ Found member: {member['name']} ({member['username']})")
+                    yield member
 
-            if not members:
-                print("⚠️ No members found. This might be due to:")
-                print("1. Free tier limitations")
-                print("2. Board permissions")
-                print("3. UI changes in Trello")
+            if not seen:
+                log.warning("⚠️ No members found. This might be due to:")
+                log.warning("1. Free tier limitations")
+                log.warning("2. Board permissions")
+                log.warning("3. UI changes in Trello")
                 # Fallback: At least get current user info
                 try:
-                    user_menu = await self.page.locator('[data-testid="header-member-menu-button"]').first
-                    if user_menu:
-                        members.append({
-                            'name': 'Current User',
-                            'username': 'current_user',
-                            'email': self.email,
-                            'role': 'Admin',
-                            'last_login': 'Currently active'
-                        })
+                    user_menu = await page.locator('[data-testid="header-member-menu-button"]').first
                 except:
-                    pass
-            print(f"✅ Found {len(members)} members")
-            return members
+                    user_menu = None
+                if user_menu:
+                    seen.add('current_user')
+                    yield {
+                        'name': 'Current User',
+                        'username': 'current_user',
+                        'email': self.email,
+                        'role': 'Admin',
+                        'last_login': 'Currently active'
+                    }
+            log.info(f"✅ Found {len(seen)} members")
             
         except Exception as e:
-            print(f"❌ Scraping error: {str(e)}")
-            return []
+            log.error(f"❌ Scraping error: {str(e)}")
+    
+    async def scrape_boards(self, board_urls: Optional[List[str]] = None,
+                            pool_size: Optional[int] = None) -> AsyncIterator[Tuple[str, List[Dict]]]:
+        """Log in once and scrape several boards concurrently over a bounded page pool.
+        
+        Yields (board_url, members) as each board finishes. A board that fails
+        yields an empty member list instead of aborting the remaining boards.
+        """
+        board_urls = list(board_urls or self.board_urls)
+        pool_size = max(1, min(pool_size or self.pool_size, len(board_urls) or 1))
+        
+        await self.setup_browser()
+        if not await self.ensure_logged_in():
+            for board_url in board_urls:
+                yield board_url, []
+            return
+        
+        log.info(f"🧵 Scraping {len(board_urls)} board(s) with a pool of {pool_size} page(s)")
+        pending: asyncio.Queue = asyncio.Queue()
+        for board_url in board_urls:
+            pending.put_nowait(board_url)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def worker(worker_page):
+            # Every page shares the logged-in context, so no extra logins
+            while True:
+                try:
+                    board_url = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                members = []
+                try:
+                    members = await self.scrape_board(worker_page, board_url)
+                except Exception as e:
+                    log.error(f"❌ Error scraping {board_url}: {str(e)}")
+                await results.put((board_url, members))
+        
+        # Reuse the login page as the first pool slot
+        pages = [self.page] + [await self.context.new_page() for _ in range(pool_size - 1)]
+        workers = [asyncio.create_task(worker(p)) for p in pages]
+        try:
+            for _ in range(len(board_urls)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for extra_page in pages[1:]:
+                try:
+                    await extra_page.close()
+                except Exception:
+                    pass
+            log.info(self.readiness.summary())
+    
+    async def enrich_members(self, members_data: List) -> List:
+        """Members with profile fields filled in when TRELLO_ENRICH is on (profiles shared across boards)"""
+        if not self.enrich or not members_data:
+            return members_data
+        if self.enricher is None:
+            self.enricher = ProfileEnricher(self.context, self.readiness, self.base_url,
+                                            concurrency=int(os.getenv('TRELLO_ENRICH_CONCURRENCY', str(self.pool_size))))
+        try:
+            return await self.enricher.enrich(members_data)
+        except Exception as e:
+            log.error(f"❌ Profile enrichment failed: {str(e)}")
+            return members_data
     
     async def close(self):
-        """Close browser"""
+        """Close browser (with a browser server, only this run's contexts; the server keeps running)"""
+        if self.enricher and self.enricher.cache:
+            self.enricher.cache.close()
         if self.browser:
             await self.browser.close()
-            print("�� Browser closed")
+            log.info("�� Browser closed")
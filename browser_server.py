@@ -0,0 +1,228 @@
+"""Persistent Playwright browser server shared across runs.
+
+The first run launches Firefox as a detached Playwright browser server on a
+local WebSocket endpoint and records it in a state file; later runs connect to
+it instead of launching a browser, skipping several seconds of startup. A
+server that no longer answers is killed and replaced.
+
+    python browser_server.py status | start | stop
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+from runtime_paths import check_private, runtime_dir
+from telemetry import get_logger
+
+log = get_logger('browser_server')
+
+
+def default_state_file() -> str:
+    """TRELLO_BROWSER_SERVER_FILE, else browser_server.json in the private per-user runtime directory"""
+    return os.getenv('TRELLO_BROWSER_SERVER_FILE') or os.path.join(runtime_dir(), 'browser_server.json')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _process_command(pid: int) -> Optional[str]:
+    """Command line of a running process (from /proc, else ps), or None if it cannot be read"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode(errors='replace').strip() or None
+    except OSError:
+        pass
+    try:
+        result = subprocess.run(['ps', '-o', 'command=', '-p', str(pid)], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class BrowserServer:
+    """Connects to the recorded browser server, launching or replacing it when needed"""
+
+    def __init__(self, state_file: Optional[str] = None, headless: bool = True,
+                 connect_timeout: Optional[float] = None, startup_timeout: float = 30):
+        self.state_file = state_file or default_state_file()
+        self.headless = headless
+        self.connect_timeout = connect_timeout or float(os.getenv('TRELLO_BROWSER_SERVER_CONNECT_TIMEOUT', '2'))
+        self.startup_timeout = startup_timeout
+        self._process = None
+
+    def read_state(self) -> Optional[Dict]:
+        """The recorded server, or None; a state file we did not write privately is never trusted"""
+        try:
+            # Its endpoint gets connected to and its pid killed, so it must be ours and 0600
+            check_private(self.state_file)
+            with open(self.state_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except PermissionError as e:
+            log.warning(f"⚠️ Ignoring browser server state: {str(e)}")
+            return None
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_private(path: str, data: Dict):
+        # The endpoint path is the only credential for driving the browser, so keep it private
+        temp_path = path + '.tmp'
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        # O_EXCL: never write through a file or symlink someone else planted at the temp path
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    async def health_check(self, playwright, endpoint: str):
+        """A connected browser if the server at `endpoint` answers, else None"""
+        try:
+            browser = await playwright.firefox.connect(endpoint, timeout=self.connect_timeout * 1000)
+        except Exception:
+            return None
+        if not browser.is_connected():
+            return None
+        return browser
+
+    def launch(self) -> Dict:
+        """Start a detached server process (it outlives this run) and record its endpoint"""
+        port = _free_port()
+        ws_path = f'/{secrets.token_hex(16)}'
+        config_path = self.state_file + '.config'
+        self._write_private(config_path, {'headless': self.headless, 'host': '127.0.0.1', 'port': port, 'wsPath': ws_path})
+        log_fd = os.open(self.state_file + '.log', os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        log_file = os.fdopen(log_fd, 'w')
+        self._process = subprocess.Popen(
+            [sys.executable, '-m', 'playwright', 'launch-server', '--browser', 'firefox', '--config', config_path],
+            start_new_session=True, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT
+        )
+        log_file.close()
+        state = {
+            'endpoint': f'ws://127.0.0.1:{port}{ws_path}',
+            'pid': self._process.pid,
+            'config': config_path,
+            'headless': self.headless,
+            'started_at': time.time(),
+        }
+        self._write_private(self.state_file, state)
+        return state
+
+    def stop(self, state: Optional[Dict] = None) -> bool:
+        """Terminate the recorded server process; True if one was running"""
+        state = state or self.read_state()
+        if not state:
+            return False
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        if not _pid_alive(state['pid']):
+            return False
+        if not (self._process is not None and self._process.pid == state['pid']) and not self._is_server_process(state):
+            log.warning(f"⚠️ pid {state['pid']} is no longer the recorded browser server, not stopping it")
+            return False
+        try:
+            os.killpg(state['pid'], signal.SIGTERM)
+        except OSError:
+            os.kill(state['pid'], signal.SIGTERM)
+        return True
+
+    @staticmethod
+    def _is_server_process(state: Dict) -> bool:
+        """Whether the recorded pid still runs our launch-server (pids get reused, e.g. after a reboot)"""
+        command = _process_command(state['pid'])
+        if not command or 'launch-server' not in command:
+            return False
+        return not state.get('config') or state['config'] in command
+
+    async def connect(self, playwright):
+        """(browser, reused): the running server's browser, or one from a freshly launched server"""
+        state = self.read_state()
+        if state and state.get('headless') == self.headless:
+            browser = await self.health_check(playwright, state['endpoint'])
+            if browser:
+                return browser, True
+            log.warning("⚠️ Browser server is not responding, restarting it...")
+        elif state:
+            log.info("🔄 Browser server runs with a different headless setting, replacing it...")
+        if state:
+            self.stop(state)
+
+        log.info("🚀 Starting persistent browser server...")
+        state = self.launch()
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            browser = await self.health_check(playwright, state['endpoint'])
+            if browser:
+                return browser, False
+            # poll() rather than _pid_alive: our own exited child lingers as a zombie until reaped
+            if self._process.poll() is not None:
+                break
+            await asyncio.sleep(0.25)
+        self.stop(state)
+        raise RuntimeError(f"Browser server did not start (see {self.state_file}.log)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent Playwright browser server')
+    parser.add_argument('command', choices=['status', 'start', 'stop'])
+    parser.add_argument('--headed', action='store_true', help='run the browser with a visible window')
+    args = parser.parse_args()
+    server = BrowserServer(headless=not args.headed)
+
+    if args.command == 'stop':
+        print("🛑 Browser server stopped" if server.stop() else "ℹ️ No browser server running")
+        return
+
+    async def run():
+        from playwright.async_api import async_playwright
+        playwright = await async_playwright().start()
+        try:
+            if args.command == 'start':
+                try:
+                    browser, reused = await server.connect(playwright)
+                except RuntimeError as e:
+                    print(f"❌ {str(e)}")
+                    return
+            else:
+                state = server.read_state()
+                browser = await server.health_check(playwright, state['endpoint']) if state else None
+                reused = True
+            if not browser:
+                print("ℹ️ No browser server running")
+                return
+            state = server.read_state()
+            print(f"🟢 Browser server {'already running' if reused else 'started'} "
+                  f"(pid {state['pid']}, {'headless' if state['headless'] else 'headed'}, "
+                  f"up {time.time() - state['started_at']:.0f}s)")
+            await browser.close()
+        finally:
+            await playwright.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
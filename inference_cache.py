@@ -0,0 +1,37 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from sqlite_cache import SqliteCache
+
+
+def cache_key(members_data: List[Dict], model_name: str, params: Dict, kind: str = 'api') -> str:
+    """Content address for an analysis: normalized members + model + generation parameters"""
+    normalized = sorted(json.dumps(m, sort_keys=True, default=dict) for m in members_data)
+    payload = json.dumps({
+        'kind': kind,
+        'model': model_name,
+        'params': params,
+        'members': normalized,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InferenceCache(SqliteCache):
+    """Persistent LRU + TTL cache of model outputs, stored in SQLite"""
+    
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None, allow_sampling: Optional[bool] = None):
+        super().__init__(
+            path or os.getenv('TRELLO_CACHE_DB', 'data/inference_cache.db'),
+            max_entries or int(os.getenv('TRELLO_CACHE_MAX_ENTRIES', '1000')),
+            ttl_seconds if ttl_seconds is not None else float(os.getenv('TRELLO_CACHE_TTL', str(7 * 24 * 3600))),
+        )
+        if allow_sampling is None:
+            allow_sampling = os.getenv('TRELLO_CACHE_SAMPLED', 'false').lower() == 'true'
+        self.allow_sampling = allow_sampling
+    
+    def cacheable(self, params: Dict) -> bool:
+        """Sampled outputs are not reproducible, so only cache them when explicitly allowed"""
+        return self.allow_sampling or not params.get('do_sample', False)
@@ -0,0 +1,277 @@
+"""Long-lived local inference worker for TrelloAgent's local-model path.
+
+The worker loads the model once and serves prompts over a Unix socket, so
+repeated runs skip the model load. Concurrent prompts (e.g. from several
+boards) are micro-batched into a single `generate` call.
+
+    python local_worker.py --model hf-internal-testing/tiny-random-gpt2 --quantize
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from runtime_paths import check_private, runtime_dir
+from telemetry import get_logger
+
+log = get_logger('worker')
+
+
+def default_socket() -> str:
+    """HF_LOCAL_WORKER_SOCKET, else worker.sock in the private per-user runtime directory"""
+    return os.getenv('HF_LOCAL_WORKER_SOCKET') or os.path.join(runtime_dir(), 'worker.sock')
+
+
+class BatchedGenerator:
+    """Loads a causal LM once and runs queued prompts in micro-batches"""
+
+    def __init__(self, model_name: str, quantize: bool = False, max_batch: int = 8, batch_wait_ms: int = 20):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+
+        self.torch = torch
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.prompts_served = 0
+        self.batches_run = 0
+        self.started = time.perf_counter()
+
+        log.info(f"🔄 Loading local model {model_name} (CPU)...")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        # Decoder-only models must be left-padded for batched generation
+        self.tokenizer.padding_side = 'left'
+        self.model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=torch.float32)
+        self.model.eval()
+
+        if quantize:
+            # Dynamic int8 quantization of nn.Linear layers (CPU only)
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            log.info("🗜️ Applied dynamic int8 quantization")
+        log.info("✅ Local model loaded")
+
+    async def generate(self, prompt: str, params: Dict) -> str:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((prompt, params, future))
+        return await future
+
+    async def run(self):
+        """Collect queued prompts for up to `batch_wait` and generate them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Only prompts with identical generation parameters can share a generate call
+            groups: Dict[str, List] = {}
+            for item in batch:
+                groups.setdefault(json.dumps(item[1], sort_keys=True), []).append(item)
+            for items in groups.values():
+                prompts = [item[0] for item in items]
+                try:
+                    texts = await asyncio.to_thread(self._generate_batch, prompts, items[0][1])
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, _, future), text in zip(items, texts):
+                    if not future.done():
+                        future.set_result(text)
+
+    def _generate_batch(self, prompts: List[str], params: Dict) -> List[str]:
+        params = dict(params)
+        if not params.get('do_sample'):
+            params.pop('temperature', None)
+        inputs = self.tokenizer(prompts, return_tensors='pt', padding=True)
+        with self.torch.inference_mode():
+            output = self.model.generate(**inputs, **params, pad_token_id=self.tokenizer.pad_token_id)
+        # Keep only the newly generated tokens
+        new_tokens = output[:, inputs['input_ids'].shape[1]:]
+        self.prompts_served += len(prompts)
+        self.batches_run += 1
+        return [text.strip() for text in self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)]
+
+    def stats(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            'prompts_served': self.prompts_served,
+            'batches_run': self.batches_run,
+            'avg_batch_size': self.prompts_served / self.batches_run if self.batches_run else 0,
+            'uptime_s': round(elapsed, 1),
+        }
+
+
+async def serve(socket_path: str, generator: BatchedGenerator):
+    """Newline-delimited JSON over a Unix socket: {"prompt", "params"} -> {"text"} / {"error"}"""
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                if request.get('op') == 'stats':
+                    response = generator.stats()
+                elif request.get('op') == 'ping':
+                    response = {'ok': True}
+                else:
+                    try:
+                        response = {'text': await generator.generate(request['prompt'], request.get('params', {}))}
+                    except Exception as e:
+                        response = {'error': str(e)}
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        # Only a stale socket may be replaced; unlinking a live one would orphan its worker
+        try:
+            _, writer = await asyncio.open_unix_connection(socket_path)
+        except OSError:
+            os.remove(socket_path)
+        else:
+            writer.close()
+            raise RuntimeError(f"A worker is already listening on {socket_path}")
+    server = await asyncio.start_unix_server(handle, path=socket_path, limit=2 ** 24)
+    # Prompts carry member data, so only this user may connect
+    os.chmod(socket_path, 0o600)
+    log.info(f"🟢 Local inference worker listening on {socket_path}")
+    try:
+        async with server:
+            await asyncio.gather(server.serve_forever(), generator.run())
+    finally:
+        # Only the worker that bound the socket removes it
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+class LocalWorkerClient:
+    """Client for a running local worker, starting one in the background if needed"""
+
+    def __init__(self, model_name: str, socket_path: Optional[str] = None,
+                 quantize: Optional[bool] = None, startup_timeout: float = 300):
+        self.model_name = model_name
+        self.socket_path = socket_path or default_socket()
+        self.quantize = quantize if quantize is not None else os.getenv('HF_LOCAL_QUANTIZE', 'false').lower() == 'true'
+        self.startup_timeout = startup_timeout
+        self._start_lock = asyncio.Lock()
+        self._process = None
+
+    async def _call(self, request: Dict) -> Dict:
+        # Never hand member data to a socket some other user put in our place
+        check_private(self.socket_path)
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=2 ** 24)
+        try:
+            writer.write((json.dumps(request) + '\n').encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+        finally:
+            writer.close()
+
+    async def is_running(self) -> bool:
+        try:
+            return (await self._call({'op': 'ping'})).get('ok', False)
+        except PermissionError:
+            raise
+        except (OSError, ValueError):
+            return False
+
+    async def ensure_running(self):
+        """Start a detached worker process (kept warm across runs) unless one is already up.
+        
+        Concurrent callers in this process share one start (asyncio lock); across
+        processes an flock on `<socket>.lock` lets exactly one of them spawn the worker
+        while the others wait for it to come up.
+        """
+        async with self._start_lock:
+            if await self.is_running():
+                return
+            lock_fd = os.open(self.socket_path + '.lock', os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+            try:
+                spawned = False
+                deadline = time.monotonic() + self.startup_timeout
+                while time.monotonic() < deadline:
+                    if await self.is_running():
+                        return
+                    if not spawned:
+                        try:
+                            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except BlockingIOError:
+                            pass  # another process is starting the worker
+                        else:
+                            if await self.is_running():
+                                return
+                            self._spawn()
+                            spawned = True
+                    # A worker that died (bad model name, import error) will never answer
+                    if self._process is not None and self._process.poll() is not None:
+                        raise RuntimeError(f"Local inference worker exited with code {self._process.returncode} "
+                                           f"(see {self.socket_path}.log)")
+                    await asyncio.sleep(0.5)
+            finally:
+                # Closing the descriptor releases the flock
+                os.close(lock_fd)
+            raise TimeoutError(f"Local inference worker did not start within {self.startup_timeout:.0f}s "
+                               f"(see {self.socket_path}.log)")
+    
+    def _spawn(self):
+        log.info("🚀 Starting local inference worker...")
+        command = [sys.executable, os.path.abspath(__file__), '--model', self.model_name, '--socket', self.socket_path]
+        if self.quantize:
+            command.append('--quantize')
+        log_fd = os.open(self.socket_path + '.log', os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        log_file = os.fdopen(log_fd, 'w')
+        self._process = subprocess.Popen(command, start_new_session=True, stdin=subprocess.DEVNULL,
+                                         stdout=log_file, stderr=subprocess.STDOUT)
+        log_file.close()
+
+    async def generate(self, prompt: str, **params) -> str:
+        await self.ensure_running()
+        response = await self._call({'prompt': prompt, 'params': params})
+        if 'error' in response:
+            raise RuntimeError(f"Local worker error: {response['error']}")
+        return response['text']
+
+    async def stats(self) -> Dict:
+        return await self._call({'op': 'stats'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm, batched local inference worker')
+    parser.add_argument('--model', default=os.getenv('HF_MODEL_NAME', 'microsoft/DialoGPT-medium'))
+    parser.add_argument('--socket', default=None, help='default: HF_LOCAL_WORKER_SOCKET or a per-user runtime path')
+    parser.add_argument('--quantize', action='store_true', help='apply CPU dynamic int8 quantization')
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--batch-wait-ms', type=int, default=20)
+    args = parser.parse_args()
+    args.socket = args.socket or default_socket()
+
+    async def run():
+        generator = BatchedGenerator(args.model, args.quantize, args.max_batch, args.batch_wait_ms)
+        await serve(args.socket, generator)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
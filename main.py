@@ -1,10 +1,15 @@
 import asyncio
 import os
-import json
+import sys
 from dotenv import load_dotenv
-from browser_actions import TrelloBrowserActions
+from browser_actions import TrelloBrowserActions, board_slug
 from trello_agent import TrelloAgent
-import pandas as pd
+from snapshot_store import SnapshotStore
+from output_writers import MemberWriter
+from pipeline import finish_upgrades, open_snapshot_store, process_members, report_cache_stats
+from member_record import compact, to_records
+from member_index import MemberIndex
+from telemetry import configure_logging, get_logger, telemetry
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +17,26 @@ load_dotenv()
 # print("TRELLO_EMAIL:", os.getenv("TRELLO_EMAIL"))
 # print("TRELLO_PASSWORD:", os.getenv("TRELLO_PASSWORD"))
 # print("TRELLO_BOARD_URL:", os.getenv("TRELLO_BOARD_URL"))
+
+log = get_logger('main')
+
+async def scrape_to_disk(browser: TrelloBrowserActions, output_dir: str = 'data'):
+    """Stream scraped members straight to CSV/JSONL as they are extracted"""
+    members_data = []
+    writer = None
+    try:
+        async for member in browser.stream_members():
+            if writer is None:
+                writer = MemberWriter(output_dir)
+            writer.write(member)
+            # Keep the compact record form in memory for the rest of the run
+            members_data.append(compact(member))
+    finally:
+        if writer:
+            writer.close()
+            log.info(f"💾 Saved {writer.count} members to {writer.csv_path}")
+    return members_data
+
 async def main():
     """
     Main orchestrator function that handles the complete workflow:
@@ -19,75 +44,137 @@ async def main():
     2. Process with AI agent
     3. Generate insights and recommendations
     """
-    print("🚀 Starting Trello Automation...")
+    # Re-read logging/metrics settings now that .env is loaded
+    configure_logging()
+    telemetry.configure()
+    log.info("🚀 Starting Trello Automation...")
     
     # Initialize browser actions
     browser = TrelloBrowserActions()
     
     try:
+        if '--watch' in sys.argv or os.getenv('TRELLO_WATCH', 'false').lower() == 'true':
+            from watch import run_watch
+            await run_watch(browser)
+            return
+        
+        if len(browser.board_urls) > 1:
+            await run_multi_board(browser)
+            return
+        
         # Step 1: Scrape member data
-        print("📊 Scraping Trello member data...")
+        log.info("📊 Scraping Trello member data...")
         try:
-            members_data = await browser.scrape_members()
+            members_data = await scrape_to_disk(browser)
         except Exception as e:
-            print(f"❌ Error during scraping: {str(e)}")
+            log.error(f"❌ Error during scraping: {str(e)}")
             members_data = []
         
         if not members_data:
-            print("❌ No member data found. Please check your Trello board access.")
+            log.error("❌ No member data found. Please check your Trello board access.")
             return
         
-        # Step 2: Save to CSV
-        df = pd.DataFrame(members_data)
-        os.makedirs('data', exist_ok=True)
-        csv_path = 'data/members.csv'
-        df.to_csv(csv_path, index=False)
-        print(f"💾 Saved {len(members_data)} members to {csv_path}")
+        # Optional: fill in profile fields (the streamed CSV is rewritten with them below)
+        enriched = await browser.enrich_members(members_data)
+        members_saved = enriched is members_data
+        members_data = enriched
         
-        # Step 3: Process with AI agent
-        print("🤖 Processing data with Hugging Face AI agent...")
+        # Steps 2-6: Save, analyze, report
         agent = TrelloAgent()
-        analysis = await agent.analyze_members(members_data)
-        
-        # Step 4: Generate additional reports
-        print("📊 Generating additional reports...")
-        recommendations = agent.generate_provisioning_recommendations(members_data)
-        security_report = agent.generate_security_report(members_data)
-        
-        # Step 5: Display results
-        print("\n" + "="*50)
-        print("📋 HUGGING FACE AI ANALYSIS RESULTS")
-        print("="*50)
-        print(analysis)
-        
-        print("\n" + "="*50)
-        print("📊 PROVISIONING RECOMMENDATIONS")
-        print("="*50)
-        print(json.dumps(recommendations, indent=2))
-        
-        print("\n" + "="*50)
-        print("🔒 SECURITY REPORT")
-        print("="*50)
-        print(security_report)
-        
-        # Step 6: Save all results to files
-        with open('data/analysis_results.txt', 'w') as f:
-            f.write("HUGGING FACE AI ANALYSIS\n")
-            f.write("="*50 + "\n")
-            f.write(analysis)
-            f.write("\n\nPROVISIONING RECOMMENDATIONS\n")
-            f.write("="*50 + "\n")
-            f.write(json.dumps(recommendations, indent=2))
-            f.write("\n\nSECURITY REPORT\n")
-            f.write("="*50 + "\n")
-            f.write(security_report)
-        
-        print("\n💾 All analysis results saved to data/analysis_results.txt")
+        store = open_snapshot_store()
+        upgrade = None
+        try:
+            upgrade = await process_members(agent, members_data, board=board_slug(browser.board_url), store=store,
+                                            members_saved=members_saved)
+        finally:
+            await finish_upgrades([upgrade])
+            if store:
+                store.close()
+            report_cache_stats(agent)
+            await agent.close()
         
     except Exception as e:
-        print(f"❌ Error in main execution: {str(e)}")
+        log.error(f"❌ Error in main execution: {str(e)}")
     finally:
         await browser.close()
+        export_telemetry()
+
+async def run_multi_board(browser: TrelloBrowserActions):
+    """Scrape every configured board over a shared login.
+    
+    By default members are merged into a workspace index and reported on once per
+    person; with TRELLO_WORKSPACE_DEDUP=false every board gets its own full report.
+    """
+    log.info(f"📊 Scraping {len(browser.board_urls)} Trello boards...")
+    agent = TrelloAgent()
+    store = open_snapshot_store()
+    index = MemberIndex() if os.getenv('TRELLO_WORKSPACE_DEDUP', 'true').lower() != 'false' else None
+    failed = []
+    # Latency-SLO upgrades run in the background while later boards are processed
+    upgrades = []
+    
+    try:
+        async for board_url, members_data in browser.scrape_boards():
+            if not members_data:
+                log.error(f"❌ No member data found for {board_url}")
+                failed.append(board_url)
+                continue
+            slug = board_slug(board_url)
+            members_data = to_records(await browser.enrich_members(members_data))
+            output_dir = os.path.join('data', 'boards', slug)
+            try:
+                if index is not None:
+                    save_board_members(members_data, output_dir, slug, store)
+                    index.add_board(slug, members_data)
+                else:
+                    upgrades.append(await process_members(agent, members_data, output_dir, board=slug, store=store))
+            except Exception as e:
+                log.error(f"❌ Error processing {board_url}: {str(e)}")
+                failed.append(board_url)
+        
+        if index:
+            upgrades.append(await process_workspace(agent, index, store))
+    finally:
+        await finish_upgrades(upgrades)
+        if store:
+            store.close()
+        report_cache_stats(agent)
+        await agent.close()
+    
+    log.info(f"\n✅ Processed {len(browser.board_urls) - len(failed)}/{len(browser.board_urls)} boards")
+    for board_url in failed:
+        log.warning(f"   ⚠️ Failed: {board_url}")
+
+def save_board_members(members_data, output_dir: str, board: str, store: SnapshotStore = None):
+    """Write one board's members and record the run, leaving analysis to the workspace pass"""
+    with MemberWriter(output_dir) as writer:
+        writer.write_all(members_data)
+    log.info(f"💾 Saved {len(members_data)} members to {writer.csv_path}")
+    if store:
+        store.record_run(board, members_data)
+
+async def process_workspace(agent: TrelloAgent, index: MemberIndex, store: SnapshotStore = None,
+                            output_dir: str = os.path.join('data', 'workspace')):
+    """Report on and analyze each unique person in the workspace once (returns process_members' upgrade task)"""
+    if store:
+        index.seed_history(store.member_history())
+    log.info(f"👥 {index.appearances} board appearances → {len(index)} unique members")
+    index.write_csv(os.path.join(output_dir, 'member_index.csv'))
+    return await process_members(agent, index.unique_members(), output_dir, board='workspace', store=store)
+
+def export_telemetry():
+    """Write the metrics file (and flush the trace) and log the per-phase timings"""
+    if not telemetry.enabled:
+        return
+    summary = telemetry.summary()
+    if summary:
+        log.info(summary)
+    try:
+        telemetry.export()
+        log.info(f"📈 Metrics written to {telemetry.metrics_path}")
+    except OSError as e:
+        log.warning(f"⚠️ Could not write metrics: {str(e)}")
+    telemetry.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from member_extraction import PROFILE_READY, extract_profile
+from member_record import PLACEHOLDER, compact
+from sqlite_cache import SqliteCache
+from telemetry import get_logger, telemetry
+
+log = get_logger('enrichment')
+
+ENRICHED_FIELDS = ('email', 'last_login')
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to the server (additive increase, multiplicative decrease).
+
+    Throttled or slow responses halve the rate, at most once per cooldown since
+    concurrent requests all see the same overload, and honour Retry-After.
+    Healthy responses raise it step by step up to `max_rate`.
+    """
+
+    def __init__(self, rate: Optional[float] = None, max_rate: Optional[float] = None, burst: Optional[int] = None,
+                 slow_seconds: Optional[float] = None, min_rate: float = 0.1, increase: float = 0.1):
+        self.rate = rate or float(os.getenv('TRELLO_ENRICH_RATE', '2'))
+        self.max_rate = max_rate or float(os.getenv('TRELLO_ENRICH_MAX_RATE', '10'))
+        self.burst = burst or int(os.getenv('TRELLO_ENRICH_BURST', '4'))
+        self.slow_seconds = slow_seconds or int(os.getenv('TRELLO_ENRICH_SLOW_MS', '3000')) / 1000
+        self.min_rate = min_rate
+        self.increase = increase
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.backoffs = 0
+        self._last_backoff = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait for a token; waiters are served in arrival order"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def record(self, seconds: float, throttled: bool = False, retry_after: Optional[float] = None):
+        """Feed back one response: its latency and whether the server pushed back"""
+        now = time.monotonic()
+        self._refill(now)
+        if throttled or seconds > self.slow_seconds:
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if now - self._last_backoff >= max(1.0, 1 / self.rate):
+                self.rate = max(self.min_rate, self.rate / 2)
+                # Drop the saved-up burst too, or it would be spent straight into the overload
+                self.tokens = min(self.tokens, 0.0)
+                self._last_backoff = now
+                self.backoffs += 1
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class ProfileEnricher:
+    """Fills placeholder email/last_login fields from member profile pages.
+
+    Profiles are visited on several pages of the logged-in context in parallel,
+    paced by an AdaptiveRateLimiter, and cached per username with a TTL so a
+    person is fetched once across boards and runs.
+    """
+
+    def __init__(self, context, readiness, base_url: str, concurrency: Optional[int] = None,
+                 limiter: Optional[AdaptiveRateLimiter] = None, cache: Optional[SqliteCache] = None,
+                 max_attempts: int = 3):
+        self.context = context
+        self.readiness = readiness
+        self.base_url = base_url
+        self.concurrency = concurrency or int(os.getenv('TRELLO_ENRICH_CONCURRENCY', '4'))
+        self.limiter = limiter or AdaptiveRateLimiter()
+        if cache is None and os.getenv('TRELLO_PROFILE_CACHE', 'true').lower() != 'false':
+            cache = SqliteCache(
+                path=os.getenv('TRELLO_PROFILE_CACHE_DB', 'data/profile_cache.db'),
+                max_entries=int(os.getenv('TRELLO_PROFILE_CACHE_MAX_ENTRIES', '100000')),
+                ttl_seconds=float(os.getenv('TRELLO_PROFILE_CACHE_TTL', str(24 * 3600))),
+            )
+        self.cache = cache
+        self.max_attempts = max_attempts
+        # Profiles fetched this run, so boards scraped in the same run share them even without the disk cache
+        self.profiles: Dict[str, Dict] = {}
+
+    def _cached(self, username: str) -> Optional[Dict]:
+        if username in self.profiles:
+            return self.profiles[username]
+        value = self.cache.get(f'profile:{username}') if self.cache else None
+        if value is None:
+            return None
+        self.profiles[username] = json.loads(value)
+        return self.profiles[username]
+
+    def _store(self, username: str, profile: Dict):
+        self.profiles[username] = profile
+        if self.cache:
+            self.cache.put(f'profile:{username}', json.dumps(profile))
+
+    async def fetch(self, page, username: str) -> Dict:
+        """{'throttled', 'email', 'last_login'} for one profile, paced by the rate limiter"""
+        await self.limiter.acquire()
+        started = time.perf_counter()
+        retry_after = None
+        try:
+            response = await page.goto(f'{self.base_url}/u/{quote(username)}/activity',
+                                       wait_until='domcontentloaded', timeout=self.readiness.timeout('profile'))
+            if response is not None and response.status == 429:
+                retry_after = response.headers.get('retry-after')
+                profile = {'throttled': True, 'email': None, 'last_login': None}
+            elif response is not None and response.status == 404:
+                profile = {'throttled': False, 'email': None, 'last_login': None}
+            else:
+                profile = await extract_profile(page)
+                if not profile['throttled'] and not await page.query_selector(PROFILE_READY):
+                    # Client-rendered profile: wait for it, then read again
+                    await self.readiness.wait_for_selector(page, 'profile', PROFILE_READY, label=username, state='attached')
+                    profile = await extract_profile(page)
+        except Exception:
+            elapsed = time.perf_counter() - started
+            self.limiter.record(elapsed, throttled=False)
+            telemetry.observe('profile_fetch', elapsed, error=True)
+            raise
+        elapsed = time.perf_counter() - started
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        self.limiter.record(elapsed, throttled=profile['throttled'], retry_after=retry_after)
+        telemetry.observe('profile_fetch', elapsed, error=profile['throttled'])
+        return profile
+
+    async def enrich(self, members_data: List) -> List:
+        """Members with visible profile fields filled in (fields already known are kept)"""
+        usernames = list(dict.fromkeys(
+            member['username'] for member in members_data
+            if member['username'] and member['username'] != 'Unknown'
+            and any(member[field] == PLACEHOLDER for field in ENRICHED_FIELDS)
+        ))
+        to_fetch = [username for username in usernames if self._cached(username) is None]
+        cached = len(usernames) - len(to_fetch)
+        telemetry.inc('profile_cache_hits_total', cached)
+
+        if to_fetch:
+            with telemetry.span('enrichment'):
+                await self._fetch_all(to_fetch)
+        log.info(f"🔎 Profiles: {len(to_fetch)} fetched, {cached} cached "
+                 f"({self.limiter.backoffs} backoffs, rate now {self.limiter.rate:.1f}/s)")
+
+        enriched = []
+        for member in members_data:
+            profile = self.profiles.get(member['username'])
+            updates = {field: profile[field] for field in ENRICHED_FIELDS
+                       if profile and profile.get(field) and member[field] == PLACEHOLDER}
+            enriched.append(compact({**member, **updates}) if updates else member)
+        return enriched
+
+    async def _fetch_all(self, usernames: List[str]):
+        queue: asyncio.Queue = asyncio.Queue()
+        for username in usernames:
+            queue.put_nowait((username, 1))
+
+        async def worker(page):
+            while True:
+                try:
+                    username, attempt = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    profile = await self.fetch(page, username)
+                except Exception as e:
+                    telemetry.inc('profiles_fetched_total', result='error')
+                    log.debug(f"Profile {username} failed (attempt {attempt}): {str(e)}")
+                    profile = None
+                else:
+                    if not profile['throttled']:
+                        telemetry.inc('profiles_fetched_total', result='ok')
+                        self._store(username, {field: profile[field] for field in ENRICHED_FIELDS})
+                        continue
+                    telemetry.inc('profiles_fetched_total', result='throttled')
+                # Throttled or failed: try again later, behind the rest of the queue
+                if attempt < self.max_attempts:
+                    queue.put_nowait((username, attempt + 1))
+                else:
+                    log.warning(f"⚠️ Giving up on profile {username} after {attempt} attempts")
+
+        pages = [await self.context.new_page() for _ in range(max(1, min(self.concurrency, len(usernames))))]
+        try:
+            await asyncio.gather(*(worker(page) for page in pages))
+        finally:
+            for page in pages:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional, Tuple
+
+from member_record import PLACEHOLDER
+
+# Selectors for the board facepile and the full "board members" panel.
+# Kept together so a Trello UI change is a one-place fix.
+FACEPILE_MEMBER = '[data-testid="board-facepile-member"]'
+FACEPILE_OVERFLOW = '[data-testid="board-facepile-overflow"], [data-testid="board-facepile-more-button"]'
+MEMBER_PANEL_OPENERS = [FACEPILE_OVERFLOW, '[data-testid="board-share-button"]']
+MEMBER_PANEL_LIST = '[data-testid="board-members-list"], [role="dialog"] ul'
+MEMBER_PANEL_ITEM = '[data-testid="board-member-list-item"], li'
+
+# Member profile / activity view, read by the enrichment stage
+PROFILE_READY = '[data-testid="profile-header"], [data-testid="member-activity"]'
+PROFILE_EMAIL = '[data-testid="profile-email"], [data-testid="profile-header"] a[href^="mailto:"]'
+PROFILE_ACTIVITY_TIME = '[data-testid="member-activity"] time[datetime], [data-testid="activity-timestamp"]'
+THROTTLE_MARKERS = ['too many requests', 'rate limit']
+
+# Shared title parser: "Full Name (username)" -> {name, username}
+PARSE_TITLE_JS = """
+const parseTitle = (title) => {
+    title = (title || '').trim();
+    if (!title) return null;
+    if (title.includes('(') && title.includes(')')) {
+        return {
+            name: title.split('(')[0].trim(),
+            username: title.split('(')[1].split(')')[0].trim(),
+        };
+    }
+    return {name: title, username: 'Unknown'};
+};
+"""
+
+# One round trip: every facepile member plus the "+N" overflow count
+FACEPILE_JS = """
+([memberSelector, overflowSelector]) => {
+""" + PARSE_TITLE_JS + """
+    const members = [];
+    for (const el of document.querySelectorAll(memberSelector)) {
+        const record = parseTitle(el.getAttribute('title'));
+        if (record) members.push(record);
+    }
+    let overflow = 0;
+    const more = document.querySelector(overflowSelector);
+    if (more) {
+        const match = (more.textContent || '').match(/\\+\\s*(\\d+)/);
+        if (match) overflow = parseInt(match[1], 10);
+    }
+    return {members, overflow};
+}
+"""
+
+# One round trip: scroll a (possibly virtualized) member list to the end,
+# de-duplicating rows in the page as they are rendered and recycled.
+MEMBER_PANEL_JS = """
+async ({listSelector, itemSelector, settleMs, maxIdleRounds, maxRounds}) => {
+""" + PARSE_TITLE_JS + """
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    const list = document.querySelector(listSelector);
+    if (!list) return null;
+    
+    // Scroll the nearest scrollable ancestor (virtualized lists scroll a wrapper)
+    let scroller = list;
+    for (let el = list; el && el !== document.body; el = el.parentElement) {
+        const overflowY = getComputedStyle(el).overflowY;
+        if (/(auto|scroll)/.test(overflowY) && el.scrollHeight > el.clientHeight) {
+            scroller = el;
+            break;
+        }
+    }
+    
+    const parseItem = (item) => {
+        const titled = item.querySelector('[title]');
+        const fromTitle = parseTitle(item.getAttribute('title') || (titled && titled.getAttribute('title')));
+        if (fromTitle && fromTitle.username !== 'Unknown') return fromTitle;
+        const lines = (item.innerText || '').split('\\n').map(l => l.trim()).filter(Boolean);
+        const handle = lines.find(l => l.startsWith('@'));
+        const name = lines.find(l => !l.startsWith('@'));
+        if (!name && !handle) return fromTitle;
+        return {name: name || handle.slice(1), username: handle ? handle.slice(1) : 'Unknown'};
+    };
+    
+    const seen = new Map();
+    let idle = 0;
+    for (let round = 0; round < maxRounds && idle < maxIdleRounds; round++) {
+        const before = seen.size;
+        for (const item of list.querySelectorAll(itemSelector)) {
+            const record = parseItem(item);
+            if (!record) continue;
+            const key = record.username !== 'Unknown' ? record.username : record.name;
+            if (!seen.has(key)) seen.set(key, record);
+        }
+        const atEnd = scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - 2;
+        idle = (seen.size === before && atEnd) ? idle + 1 : 0;
+        scroller.scrollTop += Math.max(scroller.clientHeight * 0.9, 200);
+        await sleep(settleMs);
+    }
+    return Array.from(seen.values());
+}
+"""
+
+# One round trip: whatever profile fields are visible, or a throttling page
+PROFILE_JS = """
+([readySelector, emailSelector, activitySelector, markers]) => {
+    if (!document.querySelector(readySelector)) {
+        const text = (document.body && document.body.innerText || '').toLowerCase();
+        return {throttled: markers.some(m => text.includes(m)), email: null, last_login: null};
+    }
+    const email = document.querySelector(emailSelector);
+    const activity = document.querySelector(activitySelector);
+    const mailto = email && (email.getAttribute('href') || '').replace(/^mailto:/, '');
+    return {
+        throttled: false,
+        email: email ? (mailto || email.textContent.trim() || null) : null,
+        last_login: activity ? (activity.getAttribute('datetime') || activity.textContent.trim() || null) : null,
+    };
+}
+"""
+
+
+def build_member(name: str, username: str) -> Dict:
+    """Member record in the shape the rest of the pipeline expects"""
+    return {
+        'name': name,
+        'username': username,
+        'email': PLACEHOLDER,
+        'role': 'Member',
+        'last_login': PLACEHOLDER
+    }
+
+
+def member_key(member: Dict) -> str:
+    """Stable identity for a member (username, else name)"""
+    username = member.get('username')
+    return username if username and username != 'Unknown' else member.get('name', '')
+
+
+def merge_members(*groups: List[Dict]) -> List[Dict]:
+    """Concatenate member lists, keeping the first record per username (or name)"""
+    merged = {}
+    for group in groups:
+        for member in group:
+            merged.setdefault(member_key(member), member)
+    return list(merged.values())
+
+
+async def extract_facepile(page) -> Tuple[List[Dict], int]:
+    """All facepile members and the hidden "+N" overflow count, in one evaluation"""
+    result = await page.evaluate(FACEPILE_JS, [FACEPILE_MEMBER, FACEPILE_OVERFLOW])
+    members = [build_member(r['name'], r['username']) for r in result['members']]
+    return members, result['overflow']
+
+
+async def extract_member_panel(page, timeout: int = 10000, settle_ms: int = 150,
+                               max_idle_rounds: int = 3, max_rounds: int = 500) -> Optional[List[Dict]]:
+    """Open the board's member panel and read the full list with in-page scrolling.
+    
+    Returns None when no member panel could be opened.
+    """
+    for opener in MEMBER_PANEL_OPENERS:
+        button = page.locator(opener).first
+        if await button.count():
+            await button.click()
+            break
+    else:
+        return None
+    
+    try:
+        await page.wait_for_selector(MEMBER_PANEL_LIST, timeout=timeout)
+        records = await page.evaluate(MEMBER_PANEL_JS, {
+            'listSelector': MEMBER_PANEL_LIST,
+            'itemSelector': MEMBER_PANEL_ITEM,
+            'settleMs': settle_ms,
+            'maxIdleRounds': max_idle_rounds,
+            'maxRounds': max_rounds,
+        })
+    finally:
+        await page.keyboard.press('Escape')
+    
+    if records is None:
+        return None
+    return [build_member(r['name'], r['username']) for r in records]
+
+
+async def extract_profile(page) -> Dict:
+    """Visible profile fields ({email, last_login}, None when hidden) and whether the page is a throttle page"""
+    return await page.evaluate(PROFILE_JS, [PROFILE_READY, PROFILE_EMAIL, PROFILE_ACTIVITY_TIME, THROTTLE_MARKERS])
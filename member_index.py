@@ -0,0 +1,102 @@
+import csv
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from member_extraction import member_key
+from member_record import compact
+
+# When a person has different roles on different boards, the index keeps the most privileged one
+ROLE_PRIORITY = {'Observer': 0, 'Member': 1, 'Admin': 2}
+
+INDEX_COLUMNS = ['username', 'name', 'role', 'board_count', 'boards', 'first_seen', 'last_seen']
+
+
+class IndexedMember:
+    """One person across the workspace: representative record, boards and sighting times"""
+
+    __slots__ = ('member', 'boards', 'first_seen', 'last_seen')
+
+    def __init__(self, member, boards: Set[str], first_seen: float, last_seen: float):
+        self.member = member
+        self.boards = boards
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+
+    @property
+    def board_count(self) -> int:
+        return len(self.boards)
+
+
+class MemberIndex:
+    """Workspace-wide member registry keyed like member_key (username, else name).
+
+    Each person appears once however many boards they are on, so reports and AI
+    analysis over `unique_members()` run once per person rather than per board.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, IndexedMember] = {}
+        self.appearances = 0
+
+    def add_board(self, board: str, members: List, seen_at: Optional[float] = None):
+        """Merge one board's member list into the index"""
+        seen_at = seen_at or time.time()
+        for member in members:
+            self.appearances += 1
+            key = member_key(member)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = IndexedMember(compact(member), {board}, seen_at, seen_at)
+                continue
+            entry.boards.add(board)
+            if seen_at < entry.first_seen:
+                entry.first_seen = seen_at
+            if seen_at > entry.last_seen:
+                entry.last_seen = seen_at
+            if ROLE_PRIORITY.get(member['role'], 0) > ROLE_PRIORITY.get(entry.member['role'], 0):
+                entry.member = compact(member)
+
+    def seed_history(self, history: Dict[str, Tuple[float, float]]):
+        """Extend first/last-seen with earlier sightings, e.g. from SnapshotStore.member_history()"""
+        for key, (first_seen, last_seen) in history.items():
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            entry.first_seen = min(entry.first_seen, first_seen)
+            entry.last_seen = max(entry.last_seen, last_seen)
+
+    def get(self, key: str) -> Optional[IndexedMember]:
+        return self._entries.get(key)
+
+    def board_count(self, key: str) -> int:
+        entry = self._entries.get(key)
+        return entry.board_count if entry else 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Tuple[str, IndexedMember]]:
+        return iter(self._entries.items())
+
+    def unique_members(self) -> List:
+        """One member record per person, in first-seen order"""
+        return [entry.member for entry in self._entries.values()]
+
+    def write_csv(self, path: str):
+        """Per-person board counts and first/last-seen times (ISO 8601, UTC)"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        def iso(timestamp: float) -> str:
+            return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(INDEX_COLUMNS)
+            for key, entry in self._entries.items():
+                writer.writerow([key, entry.member['name'], entry.member['role'], entry.board_count,
+                                 ';'.join(sorted(entry.boards)), iso(entry.first_seen), iso(entry.last_seen)])
@@ -0,0 +1,211 @@
+import csv
+from collections.abc import Mapping
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PLACEHOLDER = 'Not available in free tier'
+MEMBER_FIELDS = ('name', 'username', 'email', 'role', 'last_login')
+
+
+class Role(IntEnum):
+    MEMBER = 0
+    ADMIN = 1
+    OBSERVER = 2
+
+    @property
+    def label(self) -> str:
+        return ROLE_LABELS[self]
+
+    @classmethod
+    def parse(cls, label: str) -> 'Role':
+        try:
+            return _ROLES_BY_LABEL[label]
+        except KeyError:
+            raise ValueError(f"Unknown role: {label!r}") from None
+
+
+ROLE_LABELS = ('Member', 'Admin', 'Observer')
+_ROLES_BY_LABEL = {label: Role(i) for i, label in enumerate(ROLE_LABELS)}
+
+
+class MemberRecord(Mapping):
+    """Compact, read-only member: slotted, role enum-coded, unavailable fields stored as None.
+
+    The repeated values (placeholder text, role labels) are shared constants;
+    names and usernames are unique per member, so they are not interned.
+
+    Reads like the legacy member dict (`member['email']` returns the placeholder
+    text), so report, snapshot and writer code accept either. Serialize with
+    `json.dumps(..., default=dict)`.
+    """
+
+    __slots__ = ('name', 'username', 'email', 'role', 'last_login')
+
+    def __init__(self, name: str, username: str, email: Optional[str] = None,
+                 role: Role = Role.MEMBER, last_login: Optional[str] = None):
+        self.name = name
+        self.username = username
+        self.email = email
+        self.role = role
+        self.last_login = last_login
+
+    @classmethod
+    def from_mapping(cls, member) -> 'MemberRecord':
+        """Raises ValueError when the member cannot be represented without loss"""
+        if type(member) is cls:
+            return member
+        try:
+            name, username, email = member['name'], member['username'], member['email']
+            role, last_login = _ROLES_BY_LABEL[member['role']], member['last_login']
+        except (KeyError, TypeError):
+            raise ValueError(f"Not a representable member: {member!r}") from None
+        if len(member) != 5 or not (type(name) is type(username) is type(email) is type(last_login) is str):
+            raise ValueError(f"Not a representable member: {member!r}")
+        record = cls.__new__(cls)
+        record.name = name
+        record.username = username
+        record.email = None if email == PLACEHOLDER else email
+        record.role = role
+        record.last_login = None if last_login == PLACEHOLDER else last_login
+        return record
+
+    def as_row(self) -> Tuple[str, str, str, str, str]:
+        """Legacy field values in MEMBER_FIELDS order"""
+        return (
+            self.name,
+            self.username,
+            PLACEHOLDER if self.email is None else self.email,
+            ROLE_LABELS[self.role],
+            PLACEHOLDER if self.last_login is None else self.last_login,
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(zip(MEMBER_FIELDS, self.as_row()))
+
+    def __getitem__(self, key: str) -> str:
+        if key == 'email':
+            return PLACEHOLDER if self.email is None else self.email
+        if key == 'role':
+            return ROLE_LABELS[self.role]
+        if key == 'last_login':
+            return PLACEHOLDER if self.last_login is None else self.last_login
+        if key == 'name' or key == 'username':
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(MEMBER_FIELDS)
+
+    def __len__(self) -> int:
+        return len(MEMBER_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"MemberRecord({self.name!r}, {self.username!r}, role={self.role.name})"
+
+
+def compact(member):
+    """A compact record for `member` if it converts losslessly, else the member unchanged"""
+    try:
+        return MemberRecord.from_mapping(member)
+    except ValueError:
+        return member
+
+
+def to_records(members: Iterable) -> List:
+    return [compact(member) for member in members]
+
+
+def read_members_csv(path: str) -> List:
+    """Load members.csv straight into compact records, without an intermediate dict per row"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        if tuple(header) != MEMBER_FIELDS:
+            return to_records(dict(zip(header, row)) for row in reader)
+        records = []
+        new = MemberRecord.__new__
+        for name, username, email, role, last_login in reader:
+            if role not in _ROLES_BY_LABEL:
+                records.append(dict(zip(MEMBER_FIELDS, (name, username, email, role, last_login))))
+                continue
+            record = new(MemberRecord)
+            record.name = name
+            record.username = username
+            record.email = None if email == PLACEHOLDER else email
+            record.role = _ROLES_BY_LABEL[role]
+            record.last_login = None if last_login == PLACEHOLDER else last_login
+            records.append(record)
+        return records
+
+
+# --- Arrow / Parquet (optional: pip install pyarrow) ----------------------
+
+def _pyarrow():
+    import pyarrow
+    return pyarrow
+
+
+def arrow_schema():
+    pa = _pyarrow()
+    # email/last_login are null where Trello does not expose them
+    return pa.schema([
+        ('name', pa.string()),
+        ('username', pa.string()),
+        ('email', pa.string()),
+        ('role', pa.dictionary(pa.int8(), pa.string())),
+        ('last_login', pa.string()),
+    ])
+
+
+def members_to_arrow(members: List):
+    """Arrow table with role dictionary-encoded and unavailable fields as nulls"""
+    pa = _pyarrow()
+    names, usernames, emails, role_codes, last_logins = [], [], [], [], []
+    role_labels = list(ROLE_LABELS)
+    for member in members:
+        if type(member) is MemberRecord:
+            email, code, last_login = member.email, int(member.role), member.last_login
+        else:
+            email, last_login = member.get('email'), member.get('last_login')
+            email = None if email == PLACEHOLDER else email
+            last_login = None if last_login == PLACEHOLDER else last_login
+            # Roles outside the enum are appended to the dictionary
+            if member.get('role') not in role_labels:
+                role_labels.append(member.get('role'))
+            code = role_labels.index(member.get('role'))
+        names.append(member['name'])
+        usernames.append(member['username'])
+        emails.append(email)
+        role_codes.append(code)
+        last_logins.append(last_login)
+    roles = pa.DictionaryArray.from_arrays(pa.array(role_codes, pa.int8()), pa.array(role_labels, pa.string()))
+    arrays = [
+        pa.array(names, pa.string()),
+        pa.array(usernames, pa.string()),
+        pa.array(emails, pa.string()),
+        roles,
+        pa.array(last_logins, pa.string()),
+    ]
+    return pa.Table.from_arrays(arrays, schema=arrow_schema())
+
+
+def arrow_to_records(table) -> List:
+    """Members from an Arrow table, as compact records"""
+    columns = [table.column(field).to_pylist() for field in MEMBER_FIELDS]
+    records = []
+    for name, username, email, role, last_login in zip(*columns):
+        try:
+            records.append(MemberRecord(name, username, email, Role.parse(role), last_login))
+        except ValueError:
+            records.append({'name': name, 'username': username, 'email': email if email is not None else PLACEHOLDER,
+                            'role': role, 'last_login': last_login if last_login is not None else PLACEHOLDER})
+    return records
+
+
+def read_members_parquet(path: str, role: Optional[str] = None) -> List:
+    """Load members from a Parquet file, optionally only those with `role` (filtered on read)"""
+    import pyarrow.parquet as pq
+    filters = [('role', '=', role)] if role else None
+    return arrow_to_records(pq.read_table(path, filters=filters))
@@ -0,0 +1,88 @@
+import asyncio
+import re
+from typing import Dict, List, Optional
+
+from member_extraction import build_member, merge_members
+from telemetry import telemetry
+
+# Resource types the member extraction never needs
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# Board payloads the Trello web app fetches: /1/boards/<id>?...members... and /1/boards/<id>/members
+BOARD_PAYLOAD_URL = re.compile(r'/1/boards?/[^/?#]+(/members|/memberships)?([/?#]|$)', re.IGNORECASE)
+
+
+async def block_heavy_resources(context):
+    """Abort requests for images, media, fonts and stylesheets on every page of `context`"""
+    async def handle(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    await context.route('**/*', handle)
+
+
+def members_from_payload(payload) -> List[Dict]:
+    """Member records from a board JSON payload (a board object or a members list)"""
+    if isinstance(payload, dict):
+        raw_members = payload.get('members') or []
+        memberships = {m.get('idMember'): m.get('memberType') for m in payload.get('memberships') or [] if isinstance(m, dict)}
+    elif isinstance(payload, list):
+        raw_members = payload
+        memberships = {}
+    else:
+        return []
+    
+    members = []
+    for raw in raw_members:
+        if not isinstance(raw, dict) or not (raw.get('username') or raw.get('fullName')):
+            continue
+        member = build_member(
+            (raw.get('fullName') or raw.get('username')).strip(),
+            raw.get('username') or 'Unknown'
+        )
+        if (raw.get('memberType') or memberships.get(raw.get('id'))) == 'admin':
+            member['role'] = 'Admin'
+        members.append(member)
+    return members
+
+
+class MemberCapture:
+    """Collects member data from board JSON responses as a page loads"""
+    
+    def __init__(self, page):
+        self.page = page
+        self.members: List[Dict] = []
+        self.payloads_seen = 0
+        self.bytes_received = 0
+        self._found = asyncio.Event()
+        page.on('response', self._on_response)
+    
+    async def _on_response(self, response):
+        if not BOARD_PAYLOAD_URL.search(response.url):
+            return
+        if 'json' not in (response.headers.get('content-type') or ''):
+            return
+        try:
+            body = await response.body()
+            self.bytes_received += len(body)
+            telemetry.inc('bytes_received_total', len(body), source='board_payload')
+            members = members_from_payload(await response.json())
+        except Exception:
+            return
+        self.payloads_seen += 1
+        if members:
+            self.members = merge_members(self.members, members)
+            self._found.set()
+    
+    async def wait(self, timeout_ms: int) -> Optional[List[Dict]]:
+        """Members seen so far, waiting up to `timeout_ms` for the first usable payload"""
+        if not self._found.is_set():
+            try:
+                await asyncio.wait_for(self._found.wait(), timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                return None
+        return list(self.members)
+    
+    def detach(self):
+        self.page.remove_listener('response', self._on_response)
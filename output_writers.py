@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+from typing import Callable, Dict, List, Optional, TextIO, Union
+
+from member_record import arrow_schema, members_to_arrow
+from telemetry import get_logger
+
+log = get_logger('writers')
+
+MEMBER_COLUMNS = ['name', 'username', 'email', 'role', 'last_login']
+
+
+class MemberWriter:
+    """Appends members to CSV and JSON-lines files as they arrive, flushing periodically.
+
+    Output is usable at any point: a crash mid-run leaves every flushed row on disk.
+    With TRELLO_PARQUET=true members are also written to members.parquet in row
+    groups of TRELLO_PARQUET_ROW_GROUP rows (the file is complete once closed).
+    """
+
+    def __init__(self, output_dir: str, flush_every: Optional[int] = None, jsonl: bool = True,
+                 parquet: Optional[bool] = None):
+        os.makedirs(output_dir, exist_ok=True)
+        self.csv_path = os.path.join(output_dir, 'members.csv')
+        self.jsonl_path = os.path.join(output_dir, 'members.jsonl') if jsonl else None
+        self.flush_every = flush_every or int(os.getenv('TRELLO_FLUSH_EVERY', '100'))
+        self.count = 0
+
+        if parquet is None:
+            parquet = os.getenv('TRELLO_PARQUET', 'false').lower() == 'true'
+        self.parquet_path = os.path.join(output_dir, 'members.parquet') if parquet else None
+        self.row_group_size = int(os.getenv('TRELLO_PARQUET_ROW_GROUP', '65536'))
+        self._parquet = None
+        self._pending: List[Dict] = []
+        if self.parquet_path:
+            try:
+                import pyarrow.parquet as pq
+                self._parquet = pq.ParquetWriter(self.parquet_path, arrow_schema(), compression='zstd')
+            except ImportError:
+                log.warning("⚠️ pyarrow is not installed, skipping Parquet output (pip install pyarrow)")
+                self.parquet_path = None
+
+        self._csv_file = open(self.csv_path, 'w', newline='')
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=MEMBER_COLUMNS,
+                                   lineterminator='\n', extrasaction='ignore')
+        self._csv.writeheader()
+        self._jsonl_file = open(self.jsonl_path, 'w') if self.jsonl_path else None
+
+    def write(self, member: Dict):
+        self._csv.writerow(member)
+        if self._jsonl_file:
+            self._jsonl_file.write(json.dumps(member, default=dict) + '\n')
+        self.count += 1
+        if self._parquet is not None:
+            self._pending.append(member)
+            if len(self._pending) >= self.row_group_size:
+                self._write_row_group()
+        if self.count % self.flush_every == 0:
+            self.flush()
+
+    def _write_row_group(self):
+        self._parquet.write_table(members_to_arrow(self._pending))
+        self._pending = []
+
+    def write_all(self, members: List[Dict]):
+        for member in members:
+            self.write(member)
+
+    def flush(self):
+        self._csv_file.flush()
+        if self._jsonl_file:
+            self._jsonl_file.flush()
+
+    def close(self):
+        self.flush()
+        self._csv_file.close()
+        if self._jsonl_file:
+            self._jsonl_file.close()
+        if self._parquet is not None:
+            if self._pending:
+                self._write_row_group()
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReportWriter:
+    """Writes analysis_results.txt section by section, flushing after each one"""
+
+    def __init__(self, path: str, width: int = 50):
+        self.path = path
+        self.width = width
+        self._file = open(path, 'w')
+        self._sections = 0
+
+    def section(self, title: str, content: Union[str, Callable[[TextIO], None]]):
+        """Append a titled section; `content` is a string or a writer taking the file"""
+        if self._sections:
+            self._file.write("\n\n")
+        self._file.write(f"{title}\n")
+        self._file.write("=" * self.width + "\n")
+        if callable(content):
+            content(self._file)
+        else:
+            self._file.write(content)
+        self._file.flush()
+        self._sections += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,210 @@
+"""Analysis and reporting for one scraped member set, shared by the CLI and watch mode."""
+import asyncio
+import json
+import os
+import sys
+
+from output_writers import MemberWriter, ReportWriter
+from report_engine import ReportEngine
+from snapshot_store import SnapshotStore, diff_members, format_delta, members_hash
+from telemetry import get_logger, telemetry
+from trello_agent import TrelloAgent
+
+log = get_logger('pipeline')
+
+
+async def run_analysis(agent: TrelloAgent, members_data, board: str = None, store: SnapshotStore = None,
+                       upgrades: list = None):
+    """AI analysis, reusing stored reports for unchanged boards and analyzing only the delta otherwise.
+    
+    Returns (analysis, stored_reports, run_id, base_run_id); stored_reports is only set for an
+    unchanged board, and base_run_id is the run whose full analysis the report is built on.
+    In latency-SLO mode, pending better analyses are appended to `upgrades`.
+    """
+    if not (store and board):
+        log.info("🤖 Processing data with Hugging Face AI agent...")
+        return await agent.analyze_members(members_data, upgrades), None, None, None
+    
+    previous = store.latest_run(board)
+    run_id = store.record_run(board, members_data)
+    stored = store.reports(previous[0]) if previous else None
+    
+    if stored:
+        previous_id, previous_hash = previous
+        base_id = store.base_run(previous_id)
+        if previous_hash == members_hash(members_data):
+            log.info("♻️ Membership unchanged since last run, reusing stored reports")
+            return stored[0], stored, run_id, base_id
+        
+        # The report is the last full analysis plus the changes since that run (not since the
+        # previous run), so it never accumulates older delta sections. Once too much has changed,
+        # the board is analyzed in full again and becomes the new base.
+        base = store.reports(base_id)
+        delta = diff_members(store.members(base_id), members_data)
+        changes = len(delta['added']) + len(delta['removed']) + len(delta['changed'])
+        max_fraction = float(os.getenv('TRELLO_DELTA_MAX_FRACTION', '0.5'))
+        if base and changes <= max_fraction * len(members_data):
+            log.info(f"📝 Since the last full analysis: {len(delta['added'])} added, "
+                     f"{len(delta['removed'])} removed, {len(delta['changed'])} changed")
+            analysis = base[0] + "\n\n" + format_delta(delta)
+            to_analyze = delta['added'] + delta['changed']
+            if to_analyze:
+                log.info("🤖 Processing changed members with Hugging Face AI agent...")
+                analysis += "\n\n" + await agent.analyze_members(to_analyze, upgrades)
+            return analysis, None, run_id, base_id
+        log.info(f"📝 {changes} membership changes since the last full analysis, re-analyzing the board")
+    
+    log.info("🤖 Processing data with Hugging Face AI agent...")
+    return await agent.analyze_members(members_data, upgrades), None, run_id, run_id
+
+
+def print_section(title: str, content):
+    """Print a titled report section; `content` is a string or a writer taking a file"""
+    print("\n" + "="*50)
+    print(title)
+    print("="*50)
+    if callable(content):
+        content(sys.stdout)
+        print()
+    else:
+        print(content)
+
+
+@telemetry.traced('process_members', labels=('board',))
+
+
+async def process_members(agent: TrelloAgent, members_data, output_dir: str = 'data',
+                          board: str = None, store: SnapshotStore = None, members_saved: bool = False):
+    """Save, analyze and report on one board's member data.
+    
+    Returns the background task applying latency-SLO upgrades to the report, or None.
+    """
+    # Save to CSV/JSONL (skipped when the members were already streamed to disk)
+    os.makedirs(output_dir, exist_ok=True)
+    if not members_saved:
+        with MemberWriter(output_dir) as writer:
+            writer.write_all(members_data)
+        log.info(f"💾 Saved {len(members_data)} members to {writer.csv_path}")
+    
+    # Optionally stream the AI analysis to the console and disk as it is generated
+    stream_file = None
+    if os.getenv('HF_STREAM', 'false').lower() == 'true':
+        stream_file = open(os.path.join(output_dir, 'analysis_stream.txt'), 'w')
+        
+        def on_token(token: str):
+            print(token, end='', flush=True)
+            stream_file.write(token)
+            stream_file.flush()
+        agent.on_token = on_token
+    
+    # Process with AI agent
+    upgrades = []
+    try:
+        analysis, stored, run_id, base_run_id = await run_analysis(agent, members_data, board, store, upgrades)
+    except BaseException:
+        if stream_file:
+            stream_file.close()
+        raise
+    finally:
+        if stream_file:
+            agent.on_token = None
+    # Hedged API calls still running past the deadline keep streaming through on_token,
+    # so with pending upgrades the file is closed once those finish (below)
+    if stream_file and not upgrades:
+        stream_file.close()
+    
+    # Display and save each report section as soon as it is ready
+    results_path = os.path.join(output_dir, 'analysis_results.txt')
+    with telemetry.span('reports'), ReportWriter(results_path) as report:
+        print_section("📋 HUGGING FACE AI ANALYSIS RESULTS", analysis)
+        report.section("HUGGING FACE AI ANALYSIS", analysis)
+        
+        if stored:
+            _, recommendations, security_report = stored
+            recommendations_json = json.dumps(recommendations, indent=2)
+            print_section("📊 PROVISIONING RECOMMENDATIONS", recommendations_json)
+            report.section("PROVISIONING RECOMMENDATIONS", recommendations_json)
+            print_section("🔒 SECURITY REPORT", security_report)
+            report.section("SECURITY REPORT", security_report)
+        else:
+            # One pass over the members computes both rule-based reports
+            log.info("📊 Generating additional reports...")
+            engine = ReportEngine(members_data)
+            print_section("📊 PROVISIONING RECOMMENDATIONS", engine.write_recommendations_json)
+            report.section("PROVISIONING RECOMMENDATIONS", engine.write_recommendations_json)
+            print_section("🔒 SECURITY REPORT", engine.write_security_report)
+            report.section("SECURITY REPORT", engine.write_security_report)
+            recommendations, security_report = engine.provisioning_recommendations(), engine.security_report()
+    
+    if run_id is not None:
+        store.save_reports(run_id, analysis, recommendations, security_report, base_run_id)
+    
+    log.info(f"\n💾 All analysis results saved to {results_path}")
+    
+    # Latency-SLO mode: better analyses that missed the deadline replace the provisional ones
+    # in the background, so the caller can move on to the next board
+    if not upgrades:
+        return None
+    task = asyncio.create_task(apply_upgrades(upgrades, results_path, analysis, recommendations,
+                                              security_report, store, run_id, base_run_id))
+    # If a newer report supersedes this one, stop the upgrades too (no-op once they finished)
+    task.add_done_callback(lambda _: [upgrade.cancel() for upgrade in upgrades])
+    if stream_file:
+        task.add_done_callback(lambda _: stream_file.close())
+    return task
+
+
+async def apply_upgrades(upgrades: list, results_path: str, analysis: str, recommendations,
+                         security_report: str, store: SnapshotStore = None, run_id: int = None,
+                         base_run_id: int = None):
+    """Rewrite one board's report (and stored run) as each better analysis arrives"""
+    for upgrade in asyncio.as_completed(upgrades):
+        try:
+            result = await upgrade
+        except Exception as e:
+            log.warning(f"⚠️ Analysis upgrade failed: {str(e)}")
+            continue
+        if not result:
+            continue
+        provisional, upgraded, source = result
+        # The fresh analysis comes last; an identical text in the carried-forward base must stay
+        head, found, tail = analysis.rpartition(provisional)
+        if found:
+            analysis = head + upgraded + tail
+        print_section(f"📋 UPGRADED ANALYSIS ({source})", upgraded)
+        rewrite_report(results_path, analysis, recommendations, security_report)
+        if run_id is not None:
+            store.save_reports(run_id, analysis, recommendations, security_report, base_run_id)
+        log.info(f"⬆️ Upgraded analysis in {results_path} with the {source} result")
+
+
+async def finish_upgrades(pending: list):
+    """Wait for background analysis upgrades, before the agent and store they use are closed"""
+    pending = [task for task in pending if task]
+    if pending:
+        log.info(f"⏳ Waiting for {len(pending)} analysis upgrade(s)...")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def rewrite_report(results_path: str, analysis: str, recommendations, security_report: str):
+    """Atomically replace analysis_results.txt, so readers never see a half-written file"""
+    temp_path = results_path + '.tmp'
+    with ReportWriter(temp_path) as report:
+        report.section("HUGGING FACE AI ANALYSIS", analysis)
+        report.section("PROVISIONING RECOMMENDATIONS", json.dumps(recommendations, indent=2))
+        report.section("SECURITY REPORT", security_report)
+    os.replace(temp_path, results_path)
+
+
+def report_cache_stats(agent: TrelloAgent):
+    """Print inference cache hit/miss counters"""
+    if agent.cache:
+        stats = agent.cache.stats()
+        log.info(f"⚡ Inference cache: {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['entries']} entries")
+
+
+def open_snapshot_store():
+    """Snapshot store for incremental runs, unless disabled with TRELLO_SNAPSHOTS=false"""
+    if os.getenv('TRELLO_SNAPSHOTS', 'true').lower() == 'false':
+        return None
+    return SnapshotStore()
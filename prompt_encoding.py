@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from member_record import MEMBER_FIELDS
+
+# json: the original indent=2 dump; json_compact: same data without whitespace;
+# table: CSV rows with constant columns factored into one note
+ENCODINGS = ('json', 'json_compact', 'table')
+
+# Columns with more repeated values than this are left unabbreviated
+ABBREVIATE_MAX_VALUES = 8
+
+
+def member_columns(members: List) -> List[str]:
+    """Field names in MEMBER_FIELDS order, then any extra keys in first-seen order"""
+    columns = list(MEMBER_FIELDS)
+    seen = set(columns)
+    for member in members:
+        if type(member) is dict and len(member) != len(MEMBER_FIELDS):
+            for key in member:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+    return columns
+
+
+def _csv_line(values: List[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(values)
+    return buffer.getvalue()
+
+
+def _codes(values: List[str]) -> Dict[str, str]:
+    """Shortest unique upper-case prefix per value, e.g. Admin -> A, Member -> M"""
+    for length in range(1, max(len(v) for v in values) + 1):
+        codes = {v: v[:length].upper() for v in values}
+        if len(set(codes.values())) == len(values) and all(codes.values()):
+            return codes
+    return {v: str(i) for i, v in enumerate(values)}
+
+
+def encode_table(members: List, abbreviate: bool = False) -> str:
+    """CSV member table; columns identical for every member are stated once above it"""
+    columns = member_columns(members)
+    rows = [[str(member.get(column, '')) for column in columns] for member in members]
+
+    notes = []
+    varying = list(range(len(columns)))
+    if len(rows) > 1:
+        constant = [i for i in varying if all(row[i] == rows[0][i] for row in rows)]
+        if constant:
+            notes.append("All members: " + "; ".join(f"{columns[i]} = {rows[0][i]}" for i in constant))
+            varying = [i for i in varying if i not in constant]
+
+    if abbreviate:
+        for i in varying:
+            counts = Counter(row[i] for row in rows)
+            # Only repeated values get codes; one-off values (names, most emails) stay verbatim
+            repeated = [value for value, count in counts.items() if count > 1 and value]
+            if not repeated or len(repeated) > ABBREVIATE_MAX_VALUES:
+                continue
+            codes = _codes(repeated)
+            if any(code in counts for code in codes.values()):
+                continue
+            legend = f"{columns[i]} codes: " + ", ".join(f"{codes[v]} = {v}" for v in repeated)
+            saved = sum((len(v) - len(codes[v])) * counts[v] for v in repeated)
+            # Only worth it when the shorter cells pay for the legend line
+            if saved <= len(legend):
+                continue
+            notes.append(legend)
+            for row in rows:
+                row[i] = codes.get(row[i], row[i])
+
+    lines = notes + [_csv_line([columns[i] for i in varying]).rstrip('\n')]
+    lines.extend(_csv_line([row[i] for i in varying]).rstrip('\n') for row in rows)
+    return "\n".join(lines)
+
+
+def encode_members(members: List, encoding: str = 'table', abbreviate: bool = False) -> str:
+    """Member data block for an analysis prompt"""
+    if encoding == 'json':
+        return json.dumps(members, indent=2, default=dict)
+    if encoding == 'json_compact':
+        return json.dumps(members, separators=(',', ':'), default=dict)
+    if encoding == 'table':
+        return encode_table(members, abbreviate)
+    raise ValueError(f"Unknown prompt encoding '{encoding}' (choose from: {', '.join(ENCODINGS)})")
+
+
+def encode_each(members: List, encoding: str = 'table') -> List[str]:
+    """Per-member serialization, an upper bound on each member's share of an encoded prompt"""
+    if encoding == 'table':
+        columns = member_columns(members)
+        return [_csv_line([str(member.get(column, '')) for column in columns]) for member in members]
+    return [encode_members(member, encoding) for member in members]
+
+
+def load_token_counter(model_name: str, tokenizer=None) -> Callable[[List[str]], List[int]]:
+    """Batch token counter using the model's tokenizer; raises if it cannot be loaded"""
+    if tokenizer is None:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return lambda batch: [len(ids) for ids in tokenizer(batch)['input_ids']]
+
+
+def estimate_tokens(texts: List[str]) -> List[int]:
+    """~4 characters per token, for when no tokenizer is available"""
+    return [len(text) // 4 + 1 for text in texts]
+
+
+def compare_encodings(members: List, count_tokens: Optional[Callable[[List[str]], List[int]]] = None) -> Dict[str, Dict]:
+    """Characters and tokens of the member block under each encoding"""
+    count_tokens = count_tokens or estimate_tokens
+    variants = {encoding: encode_members(members, encoding) for encoding in ENCODINGS}
+    variants['table_abbrev'] = encode_members(members, 'table', abbreviate=True)
+    tokens = count_tokens(list(variants.values()))
+    baseline = tokens[0] or 1
+    return {
+        name: {
+            'chars': len(text),
+            'tokens': count,
+            'tokens_per_member': round(count / max(1, len(members)), 2),
+            'vs_json': round(count / baseline, 3),
+        }
+        for (name, text), count in zip(variants.items(), tokens)
+    }
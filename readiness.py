@@ -0,0 +1,125 @@
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from telemetry import get_logger, telemetry
+
+log = get_logger('readiness')
+
+# Per-step (budget_ms, timeout_ms). The budget is how long a step is expected
+# to take; going over it is reported but not fatal. The timeout is a hard limit.
+PROFILES: Dict[str, Dict[str, tuple]] = {
+    'fast': {
+        'session_probe': (1000, 5000),
+        'login_page': (2000, 15000),
+        'password_form': (1500, 15000),
+        'login_complete': (3000, 10000),
+        'board': (3000, 15000),
+        'members': (1500, 10000),
+        'members_settled': (300, 2000),
+        'response': (3000, 15000),
+        'profile': (1500, 10000),
+    },
+    'conservative': {
+        'session_probe': (3000, 10000),
+        'login_page': (5000, 30000),
+        'password_form': (4000, 30000),
+        'login_complete': (8000, 30000),
+        'board': (8000, 30000),
+        'members': (5000, 20000),
+        'members_settled': (1000, 5000),
+        'response': (8000, 30000),
+        'profile': (4000, 30000),
+    },
+}
+
+# Resolves once no DOM mutation has been seen around `selector` for `quietMs`.
+# Observes the match's parent so sibling insertions (e.g. more members) count.
+DOM_QUIET_JS = """
+([selector, quietMs, timeoutMs]) => new Promise(resolve => {
+    const match = document.querySelector(selector);
+    const target = (match && match.parentElement) || document.body;
+    let quietTimer = null;
+    let hardTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (settled) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(settled);
+    };
+    observer.observe(target, {childList: true, subtree: true, attributes: true});
+    quietTimer = setTimeout(() => done(true), quietMs);
+    hardTimer = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+
+class Readiness:
+    """Waits on concrete page signals with per-step budgets, and records how long each took"""
+    
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = profile or os.getenv('TRELLO_READINESS_PROFILE', 'fast')
+        if self.profile not in PROFILES:
+            raise ValueError(f"Unknown readiness profile '{self.profile}' (choose from: {', '.join(PROFILES)})")
+        self.steps = dict(PROFILES[self.profile])
+        # Per-step overrides, e.g. TRELLO_BOARD_TIMEOUT_MS=20000 or TRELLO_MEMBERS_BUDGET_MS=800
+        for step, (budget, timeout) in self.steps.items():
+            budget = int(os.getenv(f'TRELLO_{step.upper()}_BUDGET_MS', budget))
+            timeout = int(os.getenv(f'TRELLO_{step.upper()}_TIMEOUT_MS', timeout))
+            self.steps[step] = (budget, timeout)
+        # Bounded, so a long-running watcher does not accumulate every wait it ever made
+        self.timings: Deque[Dict] = deque(maxlen=int(os.getenv('TRELLO_READINESS_HISTORY', '1000')))
+    
+    def timeout(self, step: str) -> int:
+        return self.steps[step][1]
+    
+    def record(self, step: str, started: float, ok: bool, label: str = '') -> float:
+        """Record how long a step waited and warn if it went over budget"""
+        waited_ms = (time.perf_counter() - started) * 1000
+        budget = self.steps[step][0]
+        self.timings.append({
+            'step': step,
+            'label': label,
+            'waited_ms': round(waited_ms, 1),
+            'budget_ms': budget,
+            'over_budget': waited_ms > budget,
+            'ok': ok,
+        })
+        telemetry.observe('wait', waited_ms / 1000, error=not ok, step=step, board=label or None)
+        if waited_ms > budget:
+            log.warning(f"⏱️ {step}{f' [{label}]' if label else ''} took {waited_ms:.0f}ms (budget {budget}ms)")
+        return waited_ms
+    
+    async def wait_for_selector(self, page, step: str, selector: str, label: str = '', state: str = 'visible'):
+        """Wait for `selector` to reach `state` within the step's timeout"""
+        started = time.perf_counter()
+        try:
+            handle = await page.wait_for_selector(selector, timeout=self.timeout(step), state=state)
+        except Exception:
+            self.record(step, started, False, label)
+            raise
+        self.record(step, started, True, label)
+        return handle
+    
+    async def wait_for_dom_quiet(self, page, step: str, selector: str = 'body', quiet_ms: int = 250, label: str = '') -> bool:
+        """Wait until no DOM mutations have occurred under `selector` for `quiet_ms`"""
+        started = time.perf_counter()
+        settled = await page.evaluate(DOM_QUIET_JS, [selector, quiet_ms, self.timeout(step)])
+        self.record(step, started, settled, label)
+        return settled
+    
+    def summary(self) -> str:
+        """Human-readable table of per-step waits"""
+        lines = [f"⏱️ Readiness timings (profile: {self.profile})"]
+        for t in self.timings:
+            flag = '⚠️' if t['over_budget'] or not t['ok'] else '✅'
+            label = f" [{t['label']}]" if t['label'] else ''
+            lines.append(f"  {flag} {t['step']}{label}: {t['waited_ms']:.0f}ms / {t['budget_ms']}ms")
+        total = sum(t['waited_ms'] for t in self.timings)
+        lines.append(f"  Total wait: {total:.0f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,197 @@
+import io
+import json
+from typing import Dict, List, TextIO
+
+from member_record import PLACEHOLDER, MemberRecord
+
+encode_string = json.encoder.encode_basestring_ascii
+
+
+def encode_value(value) -> str:
+    """JSON for a scalar entry value, matching json.dumps defaults"""
+    if isinstance(value, str):
+        return encode_string(value)
+    return json.dumps(value)
+
+
+class ReportEngine:
+    """Computes every rule-based report statistic in a single Python loop over the members.
+
+    The text and JSON renderers stream to any file-like object and produce output
+    byte-identical to the original per-report implementations.
+    """
+
+    def __init__(self, members_data: List[Dict]):
+        names, emails, roles, last_logins = [], [], [], []
+        review, upgrade_needed = [], []
+        no_email = 0
+        unknown_names = 0
+
+        for member in members_data:
+            if type(member) is MemberRecord:
+                name, _, email, role, last_login = member.as_row()
+            else:
+                name = member['name']
+                email = member['email']
+                role = member['role']
+                last_login = member['last_login']
+            names.append(name)
+            emails.append(email)
+            roles.append(role)
+            last_logins.append(last_login)
+
+            if email == PLACEHOLDER:
+                no_email += 1
+                review.append({
+                    'name': name,
+                    'reason': 'Email not available - manual review required',
+                    'action': 'Verify member access and contact information'
+                })
+
+            if last_login == PLACEHOLDER:
+                upgrade_needed.append({
+                    'name': name,
+                    'reason': 'Activity data requires paid plan',
+                    'action': 'Consider upgrading Trello plan for better user management'
+                })
+
+            if role == 'Member' and name != 'Current User':
+                review.append({
+                    'name': name,
+                    'reason': 'Role verification needed',
+                    'action': 'Confirm appropriate access level'
+                })
+
+            if 'Unknown' in name:
+                unknown_names += 1
+
+        self.columns = {'name': names, 'email': emails, 'role': roles, 'last_login': last_logins}
+        self.total = len(names)
+        self.no_email = no_email
+        self.with_email = self.total - no_email
+        self.unknown_names = unknown_names
+        self.recommendations = {
+            'provision': [],
+            'deprovision': [],
+            'review': review,
+            'upgrade_needed': upgrade_needed
+        }
+
+    # --- Streaming writers -------------------------------------------------
+
+    def write_fallback_analysis(self, out: TextIO):
+        total_members = self.total
+        members_with_email = self.with_email
+        out.write(f"""
+🔍 TRELLO TEAM ANALYSIS REPORT
+{'=' * 50}
+
+📊 TEAM COMPOSITION:
+- Total Members: {total_members}
+- Members with Email Data: {members_with_email}
+- Members without Email Data: {total_members - members_with_email}
+
+👥 MEMBER DETAILS:
+""")
+        columns = self.columns
+        for i, (name, email, role, last_login) in enumerate(
+                zip(columns['name'], columns['email'], columns['role'], columns['last_login']), 1):
+            out.write(f"\n{i}. {name}\n   Email: {email}\n   Role: {role}\n   Last Login: {last_login}\n")
+
+        out.write(f"""
+📋 DATA QUALITY ASSESSMENT:
+- Email Availability: {(members_with_email/total_members)*100:.1f}% of members
+- Role Information: Limited (Free tier restriction)
+- Activity Data: Limited (Free tier restriction)
+
+🔐 SECURITY RECOMMENDATIONS:
+1. Upgrade to Trello paid plan for better user management
+2. Regular access reviews for team members
+3. Enable two-factor authentication for all members
+4. Monitor board access and permissions
+
+⚙️ USER MANAGEMENT SUGGESTIONS:
+1. Review member access levels regularly
+2. Remove inactive members to reduce security risks
+3. Use proper naming conventions for team organization
+4. Consider board-specific permissions
+
+⚠️ LIMITATIONS NOTED:
+- Free Trello tier provides limited member data
+- Role and activity information requires paid plan
+- Email data may not be available for all members
+""")
+
+    def write_recommendations_json(self, out: TextIO, chunk_size: int = 1000):
+        """Same bytes as json.dumps(recommendations, indent=2), written in chunks.
+
+        The bucket entries are flat string dicts, so they are rendered directly with
+        the C string encoder instead of json's pure-Python indenting encoder.
+        """
+        out.write("{")
+        for b, (bucket, entries) in enumerate(self.recommendations.items()):
+            out.write(f'{"," if b else ""}\n  {encode_string(bucket)}: ')
+            if not entries:
+                out.write("[]")
+                continue
+            out.write("[")
+            buffer = []
+            for i, entry in enumerate(entries):
+                fields = ",".join(f"\n      {encode_string(k)}: {encode_value(v)}" for k, v in entry.items())
+                buffer.append(f'{"," if i else ""}\n    {{{fields}\n    }}')
+                if len(buffer) >= chunk_size:
+                    out.write("".join(buffer))
+                    buffer = []
+            out.write("".join(buffer))
+            out.write("\n  ]")
+        out.write("\n}")
+
+    def write_security_report(self, out: TextIO):
+        out.write(f"""
+🔒 SECURITY ANALYSIS REPORT
+{'=' * 40}
+
+Team Size: {self.total} members
+
+🚨 SECURITY CONCERNS:
+""")
+        concerns = []
+        if self.no_email > 0:
+            concerns.append(f"- {self.no_email} members without email data")
+        if self.unknown_names > 0:
+            concerns.append(f"- {self.unknown_names} members with unknown names")
+
+        if concerns:
+            out.write("\n".join(concerns))
+        else:
+            out.write("- No major security concerns identified")
+
+        out.write("""
+
+✅ RECOMMENDATIONS:
+1. Enable audit logging (requires paid plan)
+2. Regular access reviews
+3. Implement least privilege access
+4. Monitor for unusual activity
+5. Use strong authentication methods
+
+📈 NEXT STEPS:
+- Consider upgrading to paid Trello plan for better security features
+- Implement regular user access reviews
+- Set up automated monitoring for team changes
+""")
+
+    # --- String/dict results, for callers that need the whole report ------
+
+    def fallback_analysis(self) -> str:
+        out = io.StringIO()
+        self.write_fallback_analysis(out)
+        return out.getvalue()
+
+    def provisioning_recommendations(self) -> Dict:
+        return self.recommendations
+
+    def security_report(self) -> str:
+        out = io.StringIO()
+        self.write_security_report(out)
+        return out.getvalue()
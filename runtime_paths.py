@@ -0,0 +1,34 @@
+import os
+import stat
+
+APP_DIR = 'trello_agent'
+
+
+def runtime_dir() -> str:
+    """Private per-user directory for sockets, lock and state files.
+
+    $XDG_RUNTIME_DIR/trello_agent when available, else ~/.cache/trello_agent;
+    created 0700, and refused if another user owns it.
+    """
+    base = os.getenv('XDG_RUNTIME_DIR')
+    if not base or not os.path.isdir(base) or os.stat(base).st_uid != os.getuid():
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, APP_DIR)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a directory owned by the current user")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def check_private(path: str):
+    """Raise PermissionError unless `path` is owned by us, not a symlink, and not group/world accessible"""
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode):
+        raise PermissionError(f"{path} is a symlink")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})")
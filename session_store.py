@@ -0,0 +1,55 @@
+import base64
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from telemetry import get_logger
+
+log = get_logger('session')
+
+
+class SessionStore:
+    """Encrypted-at-rest store for the Playwright storage state (cookies/localStorage)"""
+    
+    def __init__(self, path: Optional[str] = None, secret: Optional[str] = None):
+        self.path = path or os.getenv('TRELLO_SESSION_FILE', '.trello_session.enc')
+        secret = secret or os.getenv('TRELLO_SESSION_KEY') or os.getenv('TRELLO_PASSWORD')
+        if not secret:
+            raise ValueError("Please set TRELLO_SESSION_KEY (or TRELLO_PASSWORD) in your .env file")
+        self.fernet = Fernet(self._derive_key(secret))
+    
+    @staticmethod
+    def _derive_key(secret: str) -> bytes:
+        """Derive a Fernet key from an arbitrary secret string"""
+        digest = hashlib.pbkdf2_hmac('sha256', secret.encode(), b'trello-session-store', 200_000)
+        return base64.urlsafe_b64encode(digest)
+    
+    def load(self) -> Optional[Dict]:
+        """Return the saved storage state, or None if missing or unreadable"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError, OSError) as e:
+            log.warning(f"⚠️ Ignoring unreadable saved session: {type(e).__name__}")
+            return None
+    
+    def save(self, storage_state: Dict):
+        """Encrypt and atomically write the storage state (owner-readable only)"""
+        token = self.fernet.encrypt(json.dumps(storage_state).encode())
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(tmp_path, self.path)
+    
+    def clear(self):
+        """Forget the saved session"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from member_extraction import member_key
+
+MEMBER_FIELDS = ('name', 'username', 'email', 'role', 'last_login')
+
+
+def members_hash(members: List[Dict]) -> str:
+    """Order-independent fingerprint of a member set"""
+    rows = sorted(json.dumps([m.get(f) for f in MEMBER_FIELDS]) for m in members)
+    return hashlib.sha256("\n".join(rows).encode()).hexdigest()
+
+
+def diff_members(previous: List[Dict], current: List[Dict]) -> Dict[str, List[Dict]]:
+    """Added, removed and changed members between two snapshots"""
+    old = {member_key(m): m for m in previous}
+    new = {member_key(m): m for m in current}
+    return {
+        'added': [new[k] for k in new if k not in old],
+        'removed': [old[k] for k in old if k not in new],
+        'changed': [new[k] for k in new if k in old and any(new[k].get(f) != old[k].get(f) for f in MEMBER_FIELDS)],
+    }
+
+
+def format_delta(delta: Dict[str, List[Dict]]) -> str:
+    """Plain-text summary of a membership delta"""
+    lines = ["📝 MEMBERSHIP CHANGES SINCE THE LAST FULL ANALYSIS"]
+    for kind, symbol in (('added', '+'), ('removed', '-'), ('changed', '~')):
+        lines.append(f"- {kind.title()}: {len(delta[kind])}")
+        for member in delta[kind]:
+            lines.append(f"  {symbol} {member['name']} ({member['username']})")
+    return "\n".join(lines)
+
+
+class SnapshotStore:
+    """SQLite store of scraped member sets and their reports, keyed by board and run"""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('TRELLO_SNAPSHOT_DB', 'data/snapshots.db')
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                board TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                members_hash TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS runs_board ON runs (board, id);
+            CREATE TABLE IF NOT EXISTS members (
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                name TEXT, username TEXT, email TEXT, role TEXT, last_login TEXT
+            );
+            CREATE INDEX IF NOT EXISTS members_run ON members (run_id);
+            CREATE TABLE IF NOT EXISTS reports (
+                run_id INTEGER PRIMARY KEY REFERENCES runs (id),
+                analysis TEXT,
+                recommendations TEXT,
+                security_report TEXT,
+                base_run_id INTEGER
+            );
+        """)
+        # Stores created before base_run_id existed: their reports all count as full analyses
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reports)")]
+        if 'base_run_id' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE reports ADD COLUMN base_run_id INTEGER")
+    
+    def latest_run(self, board: str) -> Optional[Tuple[int, str]]:
+        """(run_id, members_hash) of the most recent run for `board`"""
+        return self.conn.execute(
+            "SELECT id, members_hash FROM runs WHERE board = ? ORDER BY id DESC LIMIT 1", (board,)
+        ).fetchone()
+    
+    def members(self, run_id: int) -> List[Dict]:
+        rows = self.conn.execute(
+            f"SELECT {', '.join(MEMBER_FIELDS)} FROM members WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        return [dict(zip(MEMBER_FIELDS, row)) for row in rows]
+    
+    def member_history(self) -> Dict[str, Tuple[float, float]]:
+        """(first_seen, last_seen) per member key across every recorded board run"""
+        rows = self.conn.execute("""
+            SELECT CASE WHEN m.username IS NOT NULL AND m.username NOT IN ('', 'Unknown')
+                        THEN m.username ELSE m.name END AS key,
+                   MIN(r.created_at), MAX(r.created_at)
+            FROM members m JOIN runs r ON r.id = m.run_id
+            GROUP BY key
+        """).fetchall()
+        return {key: (first_seen, last_seen) for key, first_seen, last_seen in rows}
+    
+    def record_run(self, board: str, members: List[Dict]) -> int:
+        """Store a scraped member set as a new run and return its id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (board, created_at, members_hash) VALUES (?, ?, ?)",
+                (board, time.time(), members_hash(members))
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                f"INSERT INTO members (run_id, {', '.join(MEMBER_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, *[m.get(f) for f in MEMBER_FIELDS]) for m in members]
+            )
+        return run_id
+    
+    def save_reports(self, run_id: int, analysis: str, recommendations: Dict, security_report: str,
+                     base_run_id: Optional[int] = None):
+        """Store a run's reports; `base_run_id` is the run whose full analysis this one extends"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports (run_id, analysis, recommendations, security_report, base_run_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, analysis, json.dumps(recommendations), security_report, base_run_id)
+            )
+    
+    def base_run(self, run_id: int) -> int:
+        """Id of the run holding the full analysis that `run_id`'s report is built on"""
+        row = self.conn.execute("SELECT base_run_id FROM reports WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0] if row and row[0] is not None else run_id
+    
+    def reports(self, run_id: int) -> Optional[Tuple[str, Dict, str]]:
+        """(analysis, recommendations, security_report) stored for a run"""
+        row = self.conn.execute(
+            "SELECT analysis, recommendations, security_report FROM reports WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+    
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+
+class SqliteCache:
+    """Persistent LRU + TTL key/value cache stored in SQLite.
+
+    The database file is created private (0600): cached values can hold member
+    data such as emails.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600))
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (last_access)")
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+            with self.conn:
+                self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            row = None
+        if not row:
+            self.misses += 1
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            # Evict least recently used entries beyond the size limit
+            count = self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self.conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+
+    def stats(self) -> Dict:
+        entries = self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': entries}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,268 @@
+"""Spans, counters and leveled logging for the scrape -> analyze -> report pipeline.
+
+TRELLO_METRICS selects the overhead:
+  off    spans and counters are no-ops
+  basic  counters and per-span count/sum/max, exported as Prometheus text (default)
+  trace  basic, plus every finished span appended to a JSON-lines trace file
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('trello_span', default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f'trello.{name}')
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record, tagged with the active span and its labels (e.g. board)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        span = _current_span.get()
+        if span is not None:
+            entry['span'] = span.name
+            entry.update(span.labels)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """TRELLO_LOG_LEVEL (default INFO) and TRELLO_LOG_FORMAT: 'text' (plain messages) or 'json'"""
+    level = (level or os.getenv('TRELLO_LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('TRELLO_LOG_FORMAT', 'text')).lower()
+    logger = logging.getLogger('trello')
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonLogFormatter() if fmt == 'json' else logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+class Span:
+    """Times a block; nested spans inherit their parent's labels"""
+
+    __slots__ = ('telemetry', 'name', 'labels', 'span_id', 'parent_id', 'started', 'wall_started', '_token')
+
+    def __init__(self, telemetry: 'Telemetry', name: str, labels: Dict[str, str]):
+        self.telemetry = telemetry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is not None:
+            self.labels = {**parent.labels, **self.labels}
+        self.parent_id = parent.span_id if parent is not None else None
+        self.span_id = uuid.uuid4().hex[:16]
+        self._token = _current_span.set(self)
+        self.wall_started = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        _current_span.reset(self._token)
+        self.telemetry.record(self.name, duration, exc_type is not None, self.labels)
+        if self.telemetry.mode == 'trace':
+            self.telemetry.write_trace({
+                'trace_id': self.telemetry.trace_id,
+                'span_id': self.span_id,
+                'parent_id': self.parent_id,
+                'span': self.name,
+                'start': round(self.wall_started, 6),
+                'duration_ms': round(duration * 1000, 3),
+                'status': 'error' if exc_type else 'ok',
+                **({'error': f'{exc_type.__name__}: {exc}'} if exc_type else {}),
+                **self.labels,
+            })
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Telemetry:
+    """Process-wide metrics registry with JSON-lines trace and Prometheus text export"""
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        """(Re)read TRELLO_METRICS, TRELLO_TRACE_FILE and TRELLO_METRICS_FILE"""
+        self.mode = os.getenv('TRELLO_METRICS', 'basic').lower()
+        if self.mode not in ('off', 'basic', 'trace'):
+            raise ValueError("TRELLO_METRICS must be 'off', 'basic' or 'trace'")
+        self.trace_path = os.getenv('TRELLO_TRACE_FILE', 'data/trace.jsonl')
+        self.metrics_path = os.getenv('TRELLO_METRICS_FILE', 'data/metrics.prom')
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        # (span, labels) -> [count, sum_seconds, max_seconds, errors]
+        self.spans: Dict[Tuple[str, LabelKey], list] = {}
+        self._trace_file = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def span(self, name: str, **labels):
+        """Context manager timing a block as span `name`"""
+        if self.mode == 'off':
+            return NULL_SPAN
+        return Span(self, name, {k: str(v) for k, v in labels.items() if v is not None})
+
+    def traced(self, name: str, labels: Tuple[str, ...] = ()):
+        """Decorator wrapping an async function in a span; `labels` name arguments to record"""
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if self.mode == 'off':
+                    return await fn(*args, **kwargs)
+                values = {}
+                if labels:
+                    arguments = signature.bind_partial(*args, **kwargs).arguments
+                    values = {label: arguments.get(label) for label in labels}
+                with self.span(name, **values):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def inc(self, counter: str, value: float = 1, **labels):
+        if self.mode == 'off':
+            return
+        key = (counter, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, error: bool = False, **labels):
+        """Record a duration for `name` directly (for work that cannot sit inside a span, e.g. async generators)"""
+        if self.mode == 'off':
+            return
+        self.record(name, seconds, error, {k: str(v) for k, v in labels.items() if v is not None})
+
+    def record(self, name: str, seconds: float, error: bool, labels: Dict[str, str]):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        stats = self.spans.get(key)
+        if stats is None:
+            stats = self.spans[key] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+        if error:
+            stats[3] += 1
+
+    def write_trace(self, record: Dict):
+        if self._trace_file is None:
+            if os.path.dirname(self.trace_path):
+                os.makedirs(os.path.dirname(self.trace_path), exist_ok=True)
+            self._trace_file = open(self.trace_path, 'a', buffering=1)
+        self._trace_file.write(json.dumps(record) + '\n')
+
+    def totals(self) -> Dict[str, float]:
+        """Total seconds per span name, across labels"""
+        totals: Dict[str, float] = {}
+        for (name, _), stats in self.spans.items():
+            totals[name] = totals.get(name, 0.0) + stats[1]
+        return totals
+
+    def summary(self, names=('setup_browser', 'login', 'navigate', 'extraction', 'analysis', 'reports')) -> str:
+        totals = self.totals()
+        parts = [f"{name} {totals[name]:.2f}s" for name in names if name in totals]
+        return "⏱️ " + " | ".join(parts) if parts else ""
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        def fmt(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = extra + labels
+            if not pairs:
+                return ''
+            escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        lines = []
+        by_name: Dict[str, list] = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            by_name.setdefault(name, []).append((labels, value))
+        for name, series in by_name.items():
+            lines.append(f"# TYPE trello_{name} counter")
+            lines.extend(f"trello_{name}{fmt(labels)} {value:g}" for labels, value in series)
+
+        spans = sorted(self.spans.items())
+        if spans:
+            lines.append("# TYPE trello_span_seconds summary")
+            for (name, labels), (count, total, _, _) in spans:
+                lines.append(f"trello_span_seconds_count{fmt(labels, (('span', name),))} {count}")
+                lines.append(f"trello_span_seconds_sum{fmt(labels, (('span', name),))} {total:.6f}")
+            lines.append("# TYPE trello_span_seconds_max gauge")
+            lines.extend(f"trello_span_seconds_max{fmt(labels, (('span', name),))} {peak:.6f}"
+                         for (name, labels), (_, _, peak, _) in spans)
+            lines.append("# TYPE trello_span_errors_total counter")
+            lines.extend(f"trello_span_errors_total{fmt(labels, (('span', name),))} {errors}"
+                         for (name, labels), (_, _, _, errors) in spans)
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def export(self):
+        """Write the Prometheus text file and flush the trace"""
+        if self.mode == 'off':
+            return
+        if os.path.dirname(self.metrics_path):
+            os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
+        tmp_path = f'{self.metrics_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, self.metrics_path)
+        if self._trace_file is not None:
+            self._trace_file.flush()
+
+    def close(self):
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = None
+
+    async def serve(self, port: int, host: str = '127.0.0.1'):
+        """Expose /metrics over HTTP (used by watch mode); returns the aiohttp runner"""
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.prometheus(), content_type='text/plain', charset='utf-8')
+
+        app = web.Application()
+        app.router.add_get('/metrics', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        get_logger('telemetry').info(f"📈 Metrics served on http://{host}:{port}/metrics")
+        return runner
+
+
+telemetry = Telemetry()
+configure_logging()
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline  # noqa: E402
+from trello_agent import TrelloAgent  # noqa: E402
+
+MEMBERS = [
+    {'name': 'Ada Lovelace', 'username': 'ada', 'email': 'Not visible', 'role': 'admin', 'last_login': 'Not visible'},
+    {'name': 'Alan Turing', 'username': 'alan', 'email': 'Not visible', 'role': 'normal', 'last_login': 'Not visible'},
+]
+
+
+def test_streamed_api_result_upgrades_report_after_deadline(tmp_path, monkeypatch):
+    """With HF_STREAM and a deadline, the API result streamed after the deadline still upgrades the report"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('HUGGINGFACE_API_KEY', 'test')
+    monkeypatch.setenv('HF_STREAM', 'true')
+    monkeypatch.setenv('HF_ANALYSIS_DEADLINE', '0.2')
+    monkeypatch.setenv('TRELLO_CACHE', 'false')
+
+    async def run():
+        agent = TrelloAgent()
+
+        async def slow_stream(prompt, **params):
+            for token in ('STREAMED ', 'API ', 'ANALYSIS'):
+                await asyncio.sleep(0.15)
+                yield token
+        agent.client.stream_text_generation = slow_stream
+
+        try:
+            upgrade = await pipeline.process_members(agent, MEMBERS, 'out', board='board')
+            assert upgrade is not None, "the API should still be running at the deadline"
+            await pipeline.finish_upgrades([upgrade])
+        finally:
+            await agent.close()
+
+    asyncio.run(run())
+
+    with open(os.path.join('out', 'analysis_results.txt')) as f:
+        assert 'STREAMED API ANALYSIS' in f.read()
+    with open(os.path.join('out', 'analysis_stream.txt')) as f:
+        assert f.read() == 'STREAMED API ANALYSIS'
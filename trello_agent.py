@@ -1,11 +1,18 @@
 import os
-from typing import List, Dict
-import json
-import requests
-import time
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
-from huggingface_hub import InferenceClient
-import torch
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+from inference_cache import InferenceCache, cache_key
+from async_inference import AsyncTextGenerationClient
+from local_worker import LocalWorkerClient
+from report_engine import ReportEngine
+from prompt_encoding import ENCODINGS, encode_each, encode_members, estimate_tokens, load_token_counter
+from telemetry import get_logger, telemetry
+
+log = get_logger('agent')
+
+# Preference order of analysis sources in latency-SLO mode
+ANALYSIS_RANK = {'rules': 0, 'local': 1, 'api': 2}
 
 class TrelloAgent:
     def __init__(self):
@@ -15,25 +22,61 @@ class TrelloAgent:
         if not self.hf_api_key:
             raise ValueError("Please set HUGGINGFACE_API_KEY in your .env file")
         
-        # Initialize Hugging Face client
-        self.client = InferenceClient(
+        # Initialize Hugging Face client (non-blocking, pooled, with retries and deadlines)
+        self.client = AsyncTextGenerationClient(
             model=self.model_name,
             token=self.hf_api_key
         )
         
+        # Optional callback receiving API tokens as they stream in
+        self.on_token = None
+        
+        # Generation settings (greedy decoding with HF_DO_SAMPLE=false makes outputs cacheable)
+        do_sample = os.getenv('HF_DO_SAMPLE', 'true').lower() == 'true'
+        temperature = float(os.getenv('HF_TEMPERATURE', '0.7'))
+        self.api_params = {'max_new_tokens': 500, 'temperature': temperature, 'do_sample': do_sample}
+        self.local_params = {'max_new_tokens': 300, 'temperature': temperature, 'do_sample': do_sample}
+        
+        # Content-addressed cache of analyses, keyed by members + model + parameters
+        self.cache = InferenceCache() if os.getenv('TRELLO_CACHE', 'true').lower() != 'false' else None
+        
+        # Map-reduce analysis for member lists that do not fit in one prompt
+        self.chunk_tokens = int(os.getenv('HF_CHUNK_TOKENS', '1500'))
+        self.chunk_concurrency = int(os.getenv('HF_CHUNK_CONCURRENCY', '4'))
+        self._token_counter = None
+        self._token_counter_lock = threading.Lock()
+        
+        # How member data is laid out in prompts (table: CSV with constant columns factored out)
+        self.prompt_encoding = os.getenv('HF_PROMPT_ENCODING', 'table')
+        if self.prompt_encoding not in ENCODINGS:
+            raise ValueError(f"Unknown HF_PROMPT_ENCODING '{self.prompt_encoding}' (choose from: {', '.join(ENCODINGS)})")
+        self.prompt_abbreviate = os.getenv('HF_PROMPT_ABBREVIATE', 'false').lower() == 'true'
+        
+        # Latency-SLO mode: return the best analysis ready after this many seconds (0 = off)
+        self.analysis_deadline = float(os.getenv('HF_ANALYSIS_DEADLINE', '0'))
+        self.hedge_after = float(os.getenv('HF_HEDGE_AFTER', '0'))
+        self.upgrade_timeout = float(os.getenv('HF_UPGRADE_TIMEOUT', '300'))
+        
+        # Warm, batched local inference worker shared across runs (separate process)
+        self.local_worker = LocalWorkerClient(self.model_name) if os.getenv('HF_LOCAL_WORKER', 'false').lower() == 'true' else None
+        
         # Alternative: Local model setup (uncomment if you want to run locally)
         # self.setup_local_model()
         
-        print(f"🤖 Initialized Hugging Face agent with model: {self.model_name}")
+        log.info(f"🤖 Initialized Hugging Face agent with model: {self.model_name}")
     
     def setup_local_model(self):
         """Setup local Hugging Face model (optional)"""
         try:
-            print("🔄 Loading local Hugging Face model...")
+            log.info("🔄 Loading local Hugging Face model...")
+            
+            # Heavy imports are deferred to here so the API path never pays for them
+            import torch
+            from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
             
             # Check if CUDA is available
             device = "cuda" if torch.cuda.is_available() else "cpu"
-            print(f"🖥️ Using device: {device}")
+            log.info(f"🖥️ Using device: {device}")
             
             # Load tokenizer and model
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
@@ -55,25 +98,36 @@ class TrelloAgent:
                 pad_token_id=self.tokenizer.eos_token_id
             )
             
-            print("✅ Local model loaded successfully!")
+            log.info("✅ Local model loaded successfully!")
             self.use_local_model = True
             
         except Exception as e:
-            print(f"⚠️ Could not load local model: {str(e)}")
-            print("📡 Will use Hugging Face Inference API instead")
+            log.warning(f"⚠️ Could not load local model: {str(e)}")
+            log.info("📡 Will use Hugging Face Inference API instead")
             self.use_local_model = False
     
-    async def analyze_members_with_api(self, members_data: List[Dict]) -> str:
-        """Analyze member data using Hugging Face Inference API"""
-        try:
-            members_json = json.dumps(members_data, indent=2)
-            
-            # Create analysis prompt
-            prompt = f"""
-Task: Analyze the following Trello team member data and provide insights.
+    def _cached(self, members_data: List[Dict], params: Dict, kind: str):
+        """(key, cached analysis) for a request, key is None when caching does not apply"""
+        if not self.cache or not self.cache.cacheable(params):
+            return None, None
+        # The prompt layout changes the output, so it is part of the key
+        prompt_format = self.prompt_encoding + ('+abbrev' if self.prompt_abbreviate else '')
+        key = cache_key(members_data, self.model_name, params, f"{kind}:{prompt_format}")
+        cached = self.cache.get(key)
+        telemetry.inc('inference_cache_hits_total' if cached is not None else 'inference_cache_misses_total', kind=kind)
+        if cached is not None:
+            log.info(f"⚡ Using cached {kind} analysis")
+        return key, cached
+    
+    def build_api_prompt(self, members_data: List[Dict], batch_note: str = '') -> str:
+        """Analysis prompt for the Inference API"""
+        members_text = encode_members(members_data, self.prompt_encoding, self.prompt_abbreviate)
+        
+        return f"""
+Task: Analyze the following Trello team member data and provide insights.{batch_note}
 
 Team Member Data:
-{members_json}
+{members_text}
 
 Please provide a comprehensive analysis including:
 1. Team composition summary
@@ -84,202 +138,387 @@ Please provide a comprehensive analysis including:
 
 Analysis:
 """
-            
-            # Use Hugging Face Inference API
-            response = self.client.text_generation(
-                prompt,
-                max_new_tokens=500,
-                temperature=0.7,
-                do_sample=True,
-                return_full_text=False
-            )
-            
-            return response
-            
+    
+    def build_reduce_prompt(self, partial_analyses: List[str], total_members: int) -> str:
+        """Prompt that merges per-batch analyses into one report"""
+        sections = "\n\n".join(f"--- Batch {i} ---\n{a.strip()}" for i, a in enumerate(partial_analyses, 1))
+        return f"""
+Task: The member data of a Trello team with {total_members} members was analyzed in batches.
+Merge the batch analyses below into a single comprehensive analysis. Combine counts,
+de-duplicate recommendations and keep any anomalies or concerns.
+
+{sections}
+
+Please provide a comprehensive analysis including:
+1. Team composition summary
+2. Data quality assessment
+3. Security recommendations
+4. User management suggestions
+5. Any anomalies or concerns
+
+Analysis:
+"""
+    
+    async def _generate_api(self, prompt: str, on_token=None) -> str:
+        """Run one Inference API generation without blocking the event loop"""
+        with telemetry.span('inference', backend='api'):
+            return await self.client.generate(prompt, on_token=on_token, **self.api_params)
+    
+    async def _api_analysis(self, members_data: List[Dict]) -> str:
+        """One Inference API analysis (cached); raises on failure"""
+        key, cached = self._cached(members_data, self.api_params, 'api')
+        if cached is not None:
+            return cached
+        return await self._api_generate(members_data, key)
+    
+    async def _api_generate(self, members_data: List[Dict], key) -> str:
+        """Generate one API analysis and store it under `key` (None when not cacheable)"""
+        # Create analysis prompt
+        prompt = self.build_api_prompt(members_data)
+        
+        # Use Hugging Face Inference API (streamed when a token callback is set)
+        response = await self._generate_api(prompt, on_token=self.on_token)
+        
+        if key:
+            self.cache.put(key, response)
+        return response
+    
+    async def analyze_members_with_api(self, members_data: List[Dict]) -> str:
+        """Analyze member data using Hugging Face Inference API"""
+        try:
+            return await self._api_analysis(members_data)
         except Exception as e:
-            print(f"❌ Error with Hugging Face API: {str(e)}")
+            log.error(f"❌ Error with Hugging Face API: {str(e)}")
             return self.fallback_analysis(members_data)
     
-    def analyze_members_with_local_model(self, members_data: List[Dict]) -> str:
-        """Analyze member data using local Hugging Face model"""
-        try:
-            members_json = json.dumps(members_data, indent=2)
-            
-            prompt = f"""
+    def build_local_prompt(self, members_data: List[Dict]) -> str:
+        """Shorter analysis prompt for local models"""
+        members_text = encode_members(members_data, self.prompt_encoding, self.prompt_abbreviate)
+        
+        return f"""
 Analyze this Trello team data:
 
-{members_json}
+{members_text}
 
 Provide insights on team composition, security, and user management:
 """
-            
-            # Generate response using local model
-            response = self.pipeline(
-                prompt,
-                max_new_tokens=300,
-                temperature=0.7,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
-            
-            # Extract generated text
-            generated_text = response[0]['generated_text']
-            
-            # Remove the prompt from the response
-            analysis = generated_text.replace(prompt, "").strip()
-            
+    
+    def _local_cache(self, members_data: List[Dict]):
+        """(cached analysis, store) for a local-model request; pass a fresh analysis through store() to cache it.
+        
+        Shared by every local path (worker, pipeline, threaded pipeline), so they use one key scheme.
+        """
+        key, cached = self._cached(members_data, self.local_params, 'local')
+        
+        def store(analysis: str) -> str:
+            if key:
+                self.cache.put(key, analysis)
             return analysis
-            
+        return cached, store
+    
+    async def _local_worker_analysis(self, members_data: List[Dict]) -> str:
+        """One analysis on the warm local worker (cached); raises on failure"""
+        cached, store = self._local_cache(members_data)
+        if cached is not None:
+            return cached
+        
+        with telemetry.span('inference', backend='local_worker'):
+            return store(await self.local_worker.generate(self.build_local_prompt(members_data), **self.local_params))
+    
+    async def analyze_members_with_local_worker(self, members_data: List[Dict]) -> str:
+        """Analyze member data using the warm local inference worker"""
+        try:
+            return await self._local_worker_analysis(members_data)
         except Exception as e:
-            print(f"❌ Error with local model: {str(e)}")
+            log.error(f"❌ Error with local worker: {str(e)}")
             return self.fallback_analysis(members_data)
     
-    async def analyze_members(self, members_data: List[Dict]) -> str:
-        """Main analysis method that tries different approaches"""
-        print("🔍 Analyzing member data with Hugging Face...")
+    def _run_local_pipeline(self, prompt: str) -> str:
+        """Generated text for `prompt` from the in-process pipeline (blocking, touches no cache)"""
+        response = self.pipeline(
+            prompt,
+            **self.local_params,
+            pad_token_id=self.tokenizer.eos_token_id
+        )
+        
+        # Extract generated text
+        generated_text = response[0]['generated_text']
         
-        # Try API first
+        # Remove the prompt from the response
+        return generated_text.replace(prompt, "").strip()
+    
+    def _local_model_analysis(self, members_data: List[Dict]) -> str:
+        """One analysis on the in-process pipeline (cached); raises on failure"""
+        cached, store = self._local_cache(members_data)
+        if cached is not None:
+            return cached
+        
+        # Generate response using local model
+        with telemetry.span('inference', backend='local_model'):
+            return store(self._run_local_pipeline(self.build_local_prompt(members_data)))
+    
+    async def _threaded_local_model_analysis(self, members_data: List[Dict]) -> str:
+        """_local_model_analysis with only the blocking pipeline call moved to a thread.
+        
+        The SQLite cache connection belongs to the event loop's thread, so the
+        lookup and the store stay here.
+        """
+        cached, store = self._local_cache(members_data)
+        if cached is not None:
+            return cached
+        
+        with telemetry.span('inference', backend='local_model'):
+            return store(await asyncio.to_thread(self._run_local_pipeline, self.build_local_prompt(members_data)))
+    
+    def analyze_members_with_local_model(self, members_data: List[Dict]) -> str:
+        """Analyze member data using local Hugging Face model"""
         try:
-            return await self.analyze_members_with_api(members_data)
+            return self._local_model_analysis(members_data)
         except Exception as e:
-            print(f"⚠️ API analysis failed: {str(e)}")
-            
-            # Try local model if available
-            if hasattr(self, 'use_local_model') and self.use_local_model:
-                print("🔄 Trying local model...")
-                return self.analyze_members_with_local_model(members_data)
-            
-            # Fallback to rule-based analysis
+            log.error(f"❌ Error with local model: {str(e)}")
             return self.fallback_analysis(members_data)
     
-    def fallback_analysis(self, members_data: List[Dict]) -> str:
-        """Fallback analysis using rule-based approach"""
-        print("🔄 Using fallback rule-based analysis...")
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token counts using the model's tokenizer (~4 chars/token if it cannot be loaded).
         
-        total_members = len(members_data)
+        Blocking (the first call may download the tokenizer), so async code runs it on a thread.
+        """
+        with self._token_counter_lock:
+            if self._token_counter is None:
+                try:
+                    self._token_counter = load_token_counter(self.model_name, getattr(self, 'tokenizer', None))
+                except Exception as e:
+                    log.warning(f"⚠️ Could not load tokenizer, estimating token counts: {str(e)}")
+                    self._token_counter = estimate_tokens
+        return self._token_counter(texts)
+    
+    def chunk_members(self, members_data: List[Dict], token_budget: int = None) -> List[List[Dict]]:
+        """Split members into batches whose serialized size fits `token_budget` tokens"""
+        token_budget = token_budget or self.chunk_tokens
+        serialized = encode_each(members_data, self.prompt_encoding)
         
-        # Count members with email data
-        members_with_email = len([m for m in members_data if m['email'] != 'Not available in free tier'])
+        # A token is at least one character, so short payloads fit without loading a tokenizer
+        if sum(len(text) for text in serialized) <= token_budget:
+            return [members_data] if members_data else []
         
-        # Basic analysis
-        analysis = f"""
-🔍 TRELLO TEAM ANALYSIS REPORT
-{'=' * 50}
-
-📊 TEAM COMPOSITION:
-- Total Members: {total_members}
-- Members with Email Data: {members_with_email}
-- Members without Email Data: {total_members - members_with_email}
-
-👥 MEMBER DETAILS:
-"""
+        costs = self.count_tokens(serialized)
+        chunks, current, used = [], [], 0
+        for member, cost in zip(members_data, costs):
+            if current and used + cost > token_budget:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(member)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    async def analyze_members_chunked(self, members_data: List[Dict], strict: bool = False) -> str:
+        """Map-reduce analysis: token-budgeted batches analyzed concurrently, then merged.
         
-        for i, member in enumerate(members_data, 1):
-            analysis += f"\n{i}. {member['name']}"
-            analysis += f"\n   Email: {member['email']}"
-            analysis += f"\n   Role: {member['role']}"
-            analysis += f"\n   Last Login: {member['last_login']}\n"
-        
-        analysis += f"""
-📋 DATA QUALITY ASSESSMENT:
-- Email Availability: {(members_with_email/total_members)*100:.1f}% of members
-- Role Information: Limited (Free tier restriction)
-- Activity Data: Limited (Free tier restriction)
-
-🔐 SECURITY RECOMMENDATIONS:
-1. Upgrade to Trello paid plan for better user management
-2. Regular access reviews for team members
-3. Enable two-factor authentication for all members
-4. Monitor board access and permissions
-
-⚙️ USER MANAGEMENT SUGGESTIONS:
-1. Review member access levels regularly
-2. Remove inactive members to reduce security risks
-3. Use proper naming conventions for team organization
-4. Consider board-specific permissions
-
-⚠️ LIMITATIONS NOTED:
-- Free Trello tier provides limited member data
-- Role and activity information requires paid plan
-- Email data may not be available for all members
-"""
+        With `strict`, a failed single-prompt call raises instead of falling back to rules.
+        """
+        # The final (merged) analysis is cached under the whole member set, so a repeat run
+        # skips batching and the reduce step as well as the batch calls
+        key, cached = self._cached(members_data, self.api_params, 'api')
+        if cached is not None:
+            return cached
+        
+        # Tokenizing (and a first tokenizer load) blocks, so keep it off the event loop
+        chunks = await asyncio.to_thread(self.chunk_members, members_data)
+        if len(chunks) <= 1:
+            try:
+                return await self._api_generate(members_data, key)
+            except Exception as e:
+                if strict:
+                    raise
+                log.error(f"❌ Error with Hugging Face API: {str(e)}")
+                return self.fallback_analysis(members_data)
+        
+        log.info(f"🧩 Analyzing {len(members_data)} members in {len(chunks)} batches "
+                 f"(≤{self.chunk_tokens} tokens, {self.chunk_concurrency} at a time)")
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
         
-        return analysis
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self._generate_api(prompt)
+        
+        async def analyze_chunk(index: int, chunk: List[Dict]) -> str:
+            key, cached = self._cached(chunk, self.api_params, 'api-batch')
+            if cached is not None:
+                return cached
+            note = f"\nThis is batch {index} of {len(chunks)}; batch analyses will be merged afterwards."
+            result = await generate(self.build_api_prompt(chunk, note))
+            if key:
+                self.cache.put(key, result)
+            return result
+        
+        partials = await asyncio.gather(*(analyze_chunk(i, c) for i, c in enumerate(chunks, 1)))
+        
+        # Reduce, hierarchically if the partial analyses themselves exceed the budget
+        while len(partials) > 1:
+            groups = await asyncio.to_thread(self._group_by_budget, list(partials))
+            if len(groups) == 1:
+                log.info("🧩 Merging batch analyses...")
+                partials = [await generate(self.build_reduce_prompt(partials, len(members_data)))]
+                break
+            partials = await asyncio.gather(*(
+                generate(self.build_reduce_prompt(group, len(members_data))) for group in groups
+            ))
+        if key:
+            self.cache.put(key, partials[0])
+        return partials[0]
     
-    def generate_provisioning_recommendations(self, members_data: List[Dict]) -> Dict:
-        """Generate specific provisioning/deprovisioning recommendations"""
-        recommendations = {
-            'provision': [],
-            'deprovision': [],
-            'review': [],
-            'upgrade_needed': []
-        }
-        
-        for member in members_data:
-            if member['email'] == 'Not available in free tier':
-                recommendations['review'].append({
-                    'name': member['name'],
-                    'reason': 'Email not available - manual review required',
-                    'action': 'Verify member access and contact information'
-                })
-            
-            if member['last_login'] == 'Not available in free tier':
-                recommendations['upgrade_needed'].append({
-                    'name': member['name'],
-                    'reason': 'Activity data requires paid plan',
-                    'action': 'Consider upgrading Trello plan for better user management'
-                })
-            
-            if member['role'] == 'Member' and member['name'] != 'Current User':
-                recommendations['review'].append({
-                    'name': member['name'],
-                    'reason': 'Role verification needed',
-                    'action': 'Confirm appropriate access level'
-                })
-        
-        return recommendations
+    def _group_by_budget(self, texts: List[str]) -> List[List[str]]:
+        """Group texts under the token budget (at least two per group so reduction terminates)"""
+        costs = self.count_tokens(texts)
+        groups, current, used = [], [], 0
+        for text, cost in zip(texts, costs):
+            if len(current) >= 2 and used + cost > self.chunk_tokens:
+                groups.append(current)
+                current, used = [], 0
+            current.append(text)
+            used += cost
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].extend(current)
+            else:
+                groups.append(current)
+        return groups
     
-    def generate_security_report(self, members_data: List[Dict]) -> str:
-        """Generate a security-focused report"""
-        report = f"""
-🔒 SECURITY ANALYSIS REPORT
-{'=' * 40}
-
-Team Size: {len(members_data)} members
-
-🚨 SECURITY CONCERNS:
-"""
+    def _local_backend(self):
+        """Coroutine function for the local analysis path, or None if none is set up"""
+        if self.local_worker:
+            return self._local_worker_analysis
+        if getattr(self, 'use_local_model', False):
+            # The pipeline blocks, so it runs on a thread while the API call proceeds
+            return self._threaded_local_model_analysis
+        return None
+    
+    async def _collect(self, tasks: Dict[asyncio.Task, str], best: Tuple[str, str], timeout: float):
+        """Wait up to `timeout` for a higher-ranked result than `best`.
         
-        concerns = []
+        Returns the best (source, analysis) and the tasks that could still beat it;
+        tasks that no longer can are cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        until = loop.time() + timeout
+        pending = set(tasks)
+        while pending:
+            remaining = until - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source = tasks[task]
+                if task.exception() is not None:
+                    log.warning(f"⚠️ {source} analysis failed: {str(task.exception())}")
+                    continue
+                if ANALYSIS_RANK[source] > ANALYSIS_RANK[best[0]]:
+                    best = (source, task.result())
+            for task in [t for t in pending if ANALYSIS_RANK[tasks[t]] <= ANALYSIS_RANK[best[0]]]:
+                task.cancel()
+                pending.discard(task)
+        return best, pending
+    
+    async def analyze_members_hedged(self, members_data: List[Dict], upgrades: Optional[List] = None) -> str:
+        """Best analysis available within `analysis_deadline` seconds: API, else local model, else rules.
+        
+        The rule-based result is computed first, so there is always an answer at the deadline.
+        The API call starts at once and the local model is hedged in after `hedge_after`
+        seconds (or as soon as the API fails). If a better result is still running at the
+        deadline, a task resolving to (provisional, upgraded, source) is appended to
+        `upgrades`; otherwise it is cancelled.
+        """
+        best = ('rules', ReportEngine(members_data).fallback_analysis())
+        api_failed = asyncio.Event()
         
-        # Check for data availability issues
-        no_email_count = len([m for m in members_data if m['email'] == 'Not available in free tier'])
-        if no_email_count > 0:
-            concerns.append(f"- {no_email_count} members without email data")
+        async def api():
+            try:
+                return await self.analyze_members_chunked(members_data, strict=True)
+            except Exception:
+                api_failed.set()
+                raise
         
-        # Check for unknown members
-        unknown_count = len([m for m in members_data if 'Unknown' in m['name']])
-        if unknown_count > 0:
-            concerns.append(f"- {unknown_count} members with unknown names")
+        async def hedged_local(local):
+            try:
+                await asyncio.wait_for(api_failed.wait(), self.hedge_after)
+            except asyncio.TimeoutError:
+                pass
+            log.info("🔀 Hedging with local inference...")
+            return await local(members_data)
         
-        if concerns:
-            report += "\n".join(concerns)
+        tasks = {asyncio.create_task(api()): 'api'}
+        local = self._local_backend()
+        if local:
+            tasks[asyncio.create_task(hedged_local(local))] = 'local'
+        
+        best, pending = await self._collect(tasks, best, self.analysis_deadline)
+        telemetry.inc('analysis_results_total', source=best[0])
+        if pending and upgrades is not None:
+            log.info(f"⏱️ Deadline of {self.analysis_deadline:g}s reached, using {best[0]} analysis for now")
+            upgrades.append(asyncio.create_task(self._upgrade(tasks, pending, best)))
         else:
-            report += "- No major security concerns identified"
+            for task in pending:
+                task.cancel()
+        return best[1]
+    
+    async def _upgrade(self, tasks: Dict[asyncio.Task, str], pending, provisional: Tuple[str, str]):
+        """(provisional, upgraded, source) once a better result lands, None if none does in time"""
+        remaining = {task: tasks[task] for task in pending}
+        try:
+            best, pending = await self._collect(remaining, provisional, self.upgrade_timeout)
+        except asyncio.CancelledError:
+            # Superseded (or shutting down): stop the backends still working on it
+            for task in remaining:
+                task.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+        if best is provisional:
+            return None
+        telemetry.inc('analysis_upgrades_total', source=best[0])
+        return provisional[1], best[1], best[0]
+    
+    @telemetry.traced('analysis')
+    async def analyze_members(self, members_data: List[Dict], upgrades: Optional[List] = None) -> str:
+        """Main analysis method that tries different approaches"""
+        log.info("🔍 Analyzing member data with Hugging Face...")
         
-        report += f"""
-
-✅ RECOMMENDATIONS:
-1. Enable audit logging (requires paid plan)
-2. Regular access reviews
-3. Implement least privilege access
-4. Monitor for unusual activity
-5. Use strong authentication methods
-
-📈 NEXT STEPS:
-- Consider upgrading to paid Trello plan for better security features
-- Implement regular user access reviews
-- Set up automated monitoring for team changes
-"""
+        # Latency-SLO mode: race the backends against a deadline instead of trying them in turn
+        if self.analysis_deadline:
+            return await self.analyze_members_hedged(members_data, upgrades)
         
-        return report
\ No newline at end of file
+        # Try API first (batched map-reduce when the members exceed one prompt)
+        try:
+            return await self.analyze_members_chunked(members_data)
+        except Exception as e:
+            log.warning(f"⚠️ API analysis failed: {str(e)}")
+            
+            # Try local model if available (warm worker first, in-process pipeline second)
+            if self.local_worker:
+                log.info("🔄 Trying local inference worker...")
+                return await self.analyze_members_with_local_worker(members_data)
+            if hasattr(self, 'use_local_model') and self.use_local_model:
+                log.info("🔄 Trying local model...")
+                return self.analyze_members_with_local_model(members_data)
+            
+            # Fallback to rule-based analysis
+            return self.fallback_analysis(members_data)
+    
+    async def close(self):
+        """Release the pooled HTTP session"""
+        await self.client.close()
+    
+    def fallback_analysis(self, members_data: List[Dict]) -> str:
+        """Fallback analysis using rule-based approach"""
+        log.info("🔄 Using fallback rule-based analysis...")
+        return ReportEngine(members_data).fallback_analysis()
+    
+    def generate_provisioning_recommendations(self, members_data: List[Dict]) -> Dict:
+        """Generate specific provisioning/deprovisioning recommendations"""
+        return ReportEngine(members_data).provisioning_recommendations()
+    
+    def generate_security_report(self, members_data: List[Dict]) -> str:
+        """Generate a security-focused report"""
+        return ReportEngine(members_data).security_report()
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from browser_actions import TrelloBrowserActions, board_slug
+from member_record import to_records
+from pipeline import finish_upgrades, open_snapshot_store, process_members, report_cache_stats
+from snapshot_store import diff_members
+from telemetry import get_logger, telemetry
+from trello_agent import TrelloAgent
+
+log = get_logger('watch')
+
+
+class FileEventSink:
+    """Appends membership-change events to a JSON-lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    async def emit(self, event: Dict):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(event, default=dict) + '\n')
+
+    async def close(self):
+        pass
+
+
+class WebhookEventSink:
+    """POSTs membership-change events as JSON to a webhook URL"""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def emit(self, event: Dict):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        try:
+            body = json.dumps(event, default=dict)
+            async with self._session.post(self.url, data=body, headers={'Content-Type': 'application/json'}) as response:
+                if response.status >= 400:
+                    log.warning(f"⚠️ Webhook returned {response.status} for {event['board']}")
+        except Exception as e:
+            log.warning(f"⚠️ Could not deliver event for {event['board']}: {str(e)}")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+def event_sink_from_env():
+    """TRELLO_EVENT_SINK is an http(s) webhook URL or a file path (default: data/events.jsonl)"""
+    target = os.getenv('TRELLO_EVENT_SINK', 'data/events.jsonl')
+    if target.startswith(('http://', 'https://')):
+        return WebhookEventSink(target)
+    return FileEventSink(target)
+
+
+def parse_intervals(spec: str) -> Dict[str, float]:
+    """Per-board poll intervals from "board_id=60,other_id=600" """
+    intervals = {}
+    for item in spec.split(','):
+        if '=' in item:
+            board, seconds = item.split('=', 1)
+            intervals[board.strip()] = float(seconds)
+    return intervals
+
+
+class BoardPagePool:
+    """At most `size` warm pages, each remembering the board it last showed.
+
+    A board whose page is still pooled is reloaded in place; otherwise the least
+    recently used idle page is recycled and navigated to the board with goto.
+    """
+
+    def __init__(self, context, size: int):
+        self.context = context
+        self.size = max(1, size)
+        self.pages = OrderedDict()  # slug -> page, least recently used first
+        self.busy = set()
+        self.recycled = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, slug: str):
+        """(page, warm): the board's own page if still pooled, else a new or recycled one"""
+        async with self._lock:
+            if slug in self.pages:
+                page, warm = self.pages.pop(slug), True
+            elif len(self.pages) < self.size:
+                page, warm = await self.context.new_page(), False
+            else:
+                # Callers are bounded by `size`, so at least one pooled page is idle
+                victim = next(other for other in self.pages if other not in self.busy)
+                page, warm = self.pages.pop(victim), False
+                self.recycled += 1
+            self.pages[slug] = page
+            self.busy.add(slug)
+            return page, warm
+
+    def release(self, slug: str):
+        self.busy.discard(slug)
+
+    async def close(self):
+        for page in self.pages.values():
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self.pages.clear()
+
+
+class BoardWatcher:
+    """Re-polls each board on its own jittered interval from a bounded pool of warm pages.
+
+    Membership changes are emitted to a sink immediately. Analysis runs in a
+    separate worker fed by a latest-wins mailbox per board, so a slow analysis
+    never delays polling: a newer result for the same board just replaces the
+    pending one.
+    """
+
+    def __init__(self, browser: TrelloBrowserActions, sink, analyze=None,
+                 board_urls: Optional[List[str]] = None):
+        self.browser = browser
+        self.sink = sink
+        self.analyze = analyze
+        self.board_urls = list(board_urls or browser.board_urls)
+        self.default_interval = float(os.getenv('TRELLO_WATCH_INTERVAL', '300'))
+        self.intervals = parse_intervals(os.getenv('TRELLO_WATCH_INTERVALS', ''))
+        self.jitter = float(os.getenv('TRELLO_WATCH_JITTER', '0.1'))
+        self.max_backoff = float(os.getenv('TRELLO_WATCH_MAX_BACKOFF', '3600'))
+        self.session_expired = False
+        self.scrape_slots = asyncio.Semaphore(browser.pool_size)
+        self.page_pool = BoardPagePool(browser.context, browser.pool_size)
+        self.last_members: Dict[str, List[Dict]] = {}
+        self.pending: Dict[str, Tuple[str, List[Dict]]] = {}
+        self.pending_ready = asyncio.Event()
+        self.coalesced = 0
+        self.login_lock = asyncio.Lock()
+
+    def interval(self, board_url: str) -> float:
+        """Poll interval for a board, with +/- jitter so boards do not poll in lockstep"""
+        base = self.intervals.get(board_slug(board_url), self.default_interval)
+        return max(1.0, base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    async def poll_board(self, board_url: str):
+        slug = board_slug(board_url)
+        reload = False
+        misses = 0
+        # Spread the first polls out over the jitter window
+        await asyncio.sleep(random.uniform(0, self.jitter * self.interval(board_url)))
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self.scrape_slots:
+                    page, warm = await self.page_pool.acquire(slug)
+                    try:
+                        members = await self.browser.scrape_board(page, board_url, reload=warm and reload)
+                    finally:
+                        self.page_pool.release(slug)
+                reload = bool(members)
+            except Exception as e:
+                log.error(f"❌ Poll failed for {slug}: {str(e)}")
+                members, reload = [], False
+
+            if members:
+                misses = 0
+                if self.session_expired:
+                    self.session_expired = False
+                    log.info("✅ Trello session is valid again")
+                await self.handle_members(board_url, members, time.perf_counter() - started)
+            else:
+                # The session may have expired while the daemon was running. Logging in again can
+                # stop at an interactive 2FA prompt nobody can answer here, so report it and back off
+                async with self.login_lock:
+                    logged_in = await self.browser.is_logged_in()
+                if not logged_in:
+                    misses += 1
+                    await self.report_session_expired(board_url)
+
+            # Keep the metrics file current for long-running daemons
+            try:
+                telemetry.export()
+            except OSError as e:
+                log.warning(f"⚠️ Could not write metrics: {str(e)}")
+            interval = self.interval(board_url)
+            await asyncio.sleep(min(interval * 2 ** misses, max(interval, self.max_backoff)))
+
+    async def report_session_expired(self, board_url: str):
+        """Emit one session_expired event per expiry; polls keep backing off until a board scrapes again"""
+        telemetry.inc('watch_session_expired_total')
+        if self.session_expired:
+            return
+        self.session_expired = True
+        log.error("❌ Trello session expired; restart watch mode to log in again (the daemon cannot answer 2FA prompts)")
+        await self.sink.emit({
+            'type': 'session_expired',
+            'board': board_slug(board_url),
+            'board_url': board_url,
+            'timestamp': time.time(),
+        })
+
+    async def handle_members(self, board_url: str, members: List[Dict], poll_seconds: float):
+        slug = board_slug(board_url)
+        members = to_records(members)
+        previous = self.last_members.get(slug)
+        self.last_members[slug] = members
+
+        if previous is not None:
+            delta = diff_members(previous, members)
+            if not any(delta.values()):
+                log.info(f"👀 {slug}: no membership changes ({len(members)} members, {poll_seconds:.1f}s)")
+                return
+            await self.sink.emit({
+                'type': 'membership_changed',
+                'board': slug,
+                'board_url': board_url,
+                'timestamp': time.time(),
+                'member_count': len(members),
+                'added': delta['added'],
+                'removed': delta['removed'],
+                'changed': delta['changed'],
+            })
+            log.info(f"🔔 {slug}: {len(delta['added'])} added, {len(delta['removed'])} removed, {len(delta['changed'])} changed")
+        else:
+            log.info(f"👀 {slug}: watching {len(members)} members")
+
+        if self.analyze:
+            if slug in self.pending:
+                self.coalesced += 1
+            self.pending[slug] = (board_url, members)
+            self.pending_ready.set()
+
+    async def analysis_worker(self):
+        """Drain the latest-wins mailbox; polling never waits on this"""
+        while True:
+            await self.pending_ready.wait()
+            self.pending_ready.clear()
+            while self.pending:
+                slug = next(iter(self.pending))
+                board_url, members = self.pending.pop(slug)
+                try:
+                    await self.analyze(board_url, members)
+                except Exception as e:
+                    log.error(f"❌ Analysis failed for {slug}: {str(e)}")
+
+    async def run(self):
+        log.info(f"👀 Watching {len(self.board_urls)} board(s) with up to {self.page_pool.size} warm page(s), "
+                 f"every ~{self.default_interval:.0f}s")
+        tasks = [asyncio.create_task(self.poll_board(url)) for url in self.board_urls]
+        if self.analyze:
+            tasks.append(asyncio.create_task(self.analysis_worker()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.page_pool.close()
+
+
+async def run_watch(browser: TrelloBrowserActions):
+    """Daemon mode: keep the browser warm, poll boards, emit change events and analyze changes"""
+    await browser.setup_browser()
+    if not await browser.ensure_logged_in():
+        log.error("❌ Could not log in, not starting watch mode")
+        return
+
+    agent = TrelloAgent()
+    store = open_snapshot_store()
+    sink = event_sink_from_env()
+    metrics_port = os.getenv('TRELLO_METRICS_PORT')
+    metrics_server = await telemetry.serve(int(metrics_port)) if metrics_port and telemetry.enabled else None
+
+    # Latency-SLO upgrades per board; a newer analysis supersedes a pending upgrade of the older report
+    upgrades: Dict[str, asyncio.Task] = {}
+
+    async def analyze(board_url: str, members: List[Dict]):
+        slug = board_slug(board_url)
+        if slug in upgrades:
+            upgrades.pop(slug).cancel()
+        upgrade = await process_members(agent, members, os.path.join('data', 'boards', slug), board=slug, store=store)
+        if upgrade:
+            upgrades[slug] = upgrade
+
+    watcher = BoardWatcher(browser, sink, analyze)
+    try:
+        await watcher.run()
+    finally:
+        await finish_upgrades(list(upgrades.values()))
+        await sink.close()
+        if metrics_server:
+            await metrics_server.cleanup()
+        if store:
+            store.close()
+        report_cache_stats(agent)
+        await agent.close()